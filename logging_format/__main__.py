@@ -0,0 +1,10 @@
+"""
+Allow running checks with `python -m logging_format`.
+
+"""
+from sys import exit
+
+from logging_format.main import main
+
+
+exit(main())
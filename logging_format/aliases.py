@@ -0,0 +1,420 @@
+"""
+Project-wide index of the module-level names that are loggers or logger factories.
+
+Calls such as `log.info(...)` are otherwise classified by method name alone. The index follows
+imports between the modules of a project, so that `from app.log import log` is known to be a logger
+and `from app.metrics import stats` is known not to be.
+
+Each module is summarized once, keyed by the hash of its source; the summaries are persisted so that
+later runs only re-read the modules that changed. Summaries whose module has since changed on disk are
+not trusted, so a stale index falls back to classifying calls by method name.
+
+"""
+import builtins
+from ast import (
+    AnnAssign,
+    Assign,
+    AsyncFunctionDef,
+    Attribute,
+    Call,
+    ClassDef,
+    Dict,
+    DictComp,
+    FunctionDef,
+    GeneratorExp,
+    If,
+    Import,
+    ImportFrom,
+    Lambda,
+    List,
+    ListComp,
+    Name,
+    Return,
+    Set,
+    SetComp,
+    Try,
+    Tuple,
+    parse,
+    walk,
+)
+from hashlib import sha1
+from json import dump, load
+from os import stat
+from os.path import basename, dirname, exists, join, realpath, splitext
+from sys import version_info
+
+from logging_format.visitor import get_local_names
+
+if version_info >= (3, 8):
+    from ast import Constant, JoinedStr
+    SCALAR_LITERALS = (Constant, JoinedStr)
+else:
+    from ast import Bytes, NameConstant, Num, Str
+    SCALAR_LITERALS = (Bytes, NameConstant, Num, Str)
+    if version_info >= (3, 6):
+        from ast import JoinedStr
+        SCALAR_LITERALS += (JoinedStr,)
+
+
+INDEX_VERSION = 2
+
+# expressions whose values are known not to be loggers
+LITERALS = SCALAR_LITERALS + (Dict, DictComp, GeneratorExp, Lambda, List, ListComp, Set, SetComp, Tuple)
+
+# loggers and logger factories outside of the indexed project
+KNOWN_BINDINGS = {
+    "logging": {
+        "Logger": "factory",
+        "LoggerAdapter": "factory",
+        "getLogger": "factory",
+        "root": "logger",
+    },
+    "structlog": {
+        "getLogger": "factory",
+        "get_logger": "factory",
+    },
+    "loguru": {
+        "logger": "logger",
+    },
+}
+# modules whose level functions log, as in `logging.info(...)`
+LOGGER_MODULES = {
+    "logging",
+}
+
+# loaded indexes per path, with the modification time they were loaded at
+LOADED_INDEXES = {}
+
+
+def get_module_name(path):
+    """
+    Name the module a file defines, following `__init__.py` files up to the top-level package.
+
+    """
+    path = realpath(path)
+    name, _ = splitext(basename(path))
+    parts = [] if name == "__init__" else [name]
+    directory = dirname(path)
+    while exists(join(directory, "__init__.py")):
+        parts.insert(0, basename(directory))
+        directory = dirname(directory)
+    return ".".join(parts)
+
+
+def get_reference(node):
+    """
+    Render a name or attribute chain, such as `logging.getLogger`, as a dotted reference.
+
+    """
+    if isinstance(node, Name):
+        return node.id
+    if isinstance(node, Attribute):
+        reference = get_reference(node.value)
+        return None if reference is None else "{}.{}".format(reference, node.attr)
+    return None
+
+
+def describe_value(node, local_names=()):
+    """
+    Describe the value of an expression: an alias of, or a call to, a reference, a literal ("other") or unknown.
+
+    References to local names, such as a function's own variables, are unknown.
+
+    """
+    if isinstance(node, Call):
+        reference = get_reference(node.func)
+    else:
+        reference = get_reference(node)
+    if reference is not None:
+        if reference.split(".")[0] in local_names:
+            return ["unknown"]
+        return ["call" if isinstance(node, Call) else "alias", reference]
+    if isinstance(node, LITERALS):
+        return ["other"]
+    return ["unknown"]
+
+
+def resolve_import(module, level, package):
+    """
+    Resolve the module of a (possibly relative) `from ... import` statement.
+
+    """
+    if not level:
+        return module
+    parts = package.split(".") if package else []
+    if level > 1:
+        parts = parts[:len(parts) - level + 1]
+    if module:
+        parts.append(module)
+    return ".".join(parts)
+
+
+def iter_import_bindings(statement, package):
+    if isinstance(statement, Import):
+        for alias in statement.names:
+            if alias.asname:
+                yield alias.asname, ["module", alias.name]
+            else:
+                top = alias.name.split(".")[0]
+                yield top, ["module", top]
+    else:
+        module = resolve_import(statement.module, statement.level, package)
+        for alias in statement.names:
+            if alias.name != "*":
+                yield alias.asname or alias.name, ["import", module, alias.name]
+
+
+def iter_bindings(statements, package):
+    """
+    Yield the module-level bindings of a list of statements, in order.
+
+    Statements nested in top-level `if` and `try` blocks are included, as in `try: import ...`.
+
+    """
+    for statement in statements:
+        if isinstance(statement, (Import, ImportFrom)):
+            for binding in iter_import_bindings(statement, package):
+                yield binding
+        elif isinstance(statement, (Assign, AnnAssign)):
+            targets = statement.targets if isinstance(statement, Assign) else [statement.target]
+            if statement.value is not None:
+                value = describe_value(statement.value)
+                for target in targets:
+                    if isinstance(target, Name):
+                        yield target.id, value
+        elif isinstance(statement, (FunctionDef, AsyncFunctionDef)):
+            local_names = get_local_names(statement)
+            yield statement.name, ["def", [
+                describe_value(node.value, local_names)
+                for node in walk(statement)
+                if isinstance(node, Return) and node.value is not None
+            ]]
+        elif isinstance(statement, ClassDef):
+            yield statement.name, ["class", [get_reference(base) for base in statement.bases]]
+        elif isinstance(statement, (If, Try)):
+            handlers = [child for handler in getattr(statement, "handlers", ()) for child in handler.body]
+            for binding in iter_bindings(statement.body + handlers + statement.orelse, package):
+                yield binding
+
+
+def summarize_module(source, module, is_package=False):
+    """
+    Summarize the module-level bindings of a module, or return None if it is not valid python.
+
+    """
+    try:
+        tree = parse(source)
+    except (SyntaxError, ValueError):
+        return None
+    package = module if is_package else module.rpartition(".")[0]
+    return dict(iter_bindings(tree.body, package))
+
+
+class LoggerIndex(object):
+    """
+    Module summaries keyed by path, with the source hash and module name they were computed for.
+
+    """
+    def __init__(self, modules=None):
+        self.modules = modules if modules is not None else {}
+        self.paths = None
+        self.current = {}
+        self.resolved = {}
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a persisted index, starting from an empty one if it is missing or of another version.
+
+        """
+        try:
+            with open(path) as infile:
+                data = load(infile)
+        except (IOError, ValueError):
+            return cls()
+        if data.get("version") != INDEX_VERSION:
+            return cls()
+        return cls(data["modules"])
+
+    def save(self, path):
+        with open(path, "w") as outfile:
+            dump(dict(version=INDEX_VERSION, modules=self.modules), outfile, sort_keys=True)
+
+    def update(self, paths):
+        """
+        Re-index the modules that changed, dropping the ones that no longer exist.
+
+        Returns the number of modules that were re-read.
+
+        """
+        updated = 0
+        seen = set()
+        for path in paths:
+            key = realpath(path)
+            seen.add(key)
+            with open(path, "rb") as infile:
+                source = infile.read()
+            digest = sha1(source).hexdigest()
+            cached = self.modules.get(key)
+            if cached is not None and cached["digest"] == digest:
+                continue
+
+            module = get_module_name(path)
+            bindings = summarize_module(source, module, is_package=basename(key) == "__init__.py")
+            self.modules[key] = dict(digest=digest, module=module, bindings=bindings or {})
+            updated += 1
+
+        for key in set(self.modules) - seen:
+            if not exists(key):
+                del self.modules[key]
+        self.paths = None
+        self.current = {}
+        self.resolved = {}
+        return updated
+
+    def get_path(self, module):
+        if self.paths is None:
+            self.paths = {entry["module"]: key for key, entry in self.modules.items()}
+        return self.paths.get(module)
+
+    def is_current(self, path):
+        """
+        Check, once per loaded index, that an indexed file still has the source it was summarized from.
+
+        """
+        if path not in self.current:
+            try:
+                with open(path, "rb") as infile:
+                    digest = sha1(infile.read()).hexdigest()
+            except (IOError, OSError):
+                digest = None
+            self.current[path] = digest == self.modules[path]["digest"]
+        return self.current[path]
+
+    def resolve_name(self, module, name, seen):
+        """
+        Resolve a name bound in a module to "logger", "factory", "other", ("module", name) or None if unknown.
+
+        """
+        key = (module, name)
+        if key in self.resolved:
+            return self.resolved[key]
+        if key in seen:
+            return None
+        seen.add(key)
+
+        path = self.get_path(module)
+        if path is None:
+            result = KNOWN_BINDINGS.get(module, {}).get(name)
+            if result is None and self.get_path("{}.{}".format(module, name)) is not None:
+                result = ("module", "{}.{}".format(module, name))
+        elif not self.is_current(path):
+            # the module changed or was removed since it was indexed
+            result = None
+        elif name in self.modules[path]["bindings"]:
+            result = self.resolve_binding(module, self.modules[path]["bindings"][name], seen)
+        elif self.get_path("{}.{}".format(module, name)) is not None:
+            result = ("module", "{}.{}".format(module, name))
+        elif hasattr(builtins, name):
+            result = "other"
+        else:
+            result = None
+
+        self.resolved[key] = result
+        return result
+
+    def resolve_reference(self, module, reference, seen):
+        head, _, rest = reference.partition(".")
+        result = self.resolve_name(module, head, seen)
+        for attribute in rest.split(".") if rest else ():
+            if not isinstance(result, tuple):
+                return None
+            result = self.resolve_name(result[1], attribute, seen)
+        return result
+
+    def resolve_binding(self, module, binding, seen):
+        """
+        Resolve a binding; "other" is only returned for objects proven not to be loggers.
+
+        """
+        kind = binding[0]
+        if kind == "module":
+            return ("module", binding[1])
+        if kind == "import":
+            return self.resolve_name(binding[1], binding[2], seen)
+        if kind == "alias":
+            return self.resolve_reference(module, binding[1], seen)
+        if kind == "call":
+            target = self.resolve_reference(module, binding[1], seen)
+            if target == "factory":
+                return "logger"
+            # a function proven to return something else, or a class that is not a logger
+            return "other" if target == "other" else None
+        if kind == "def":
+            values = [self.resolve_binding(module, value, seen) for value in binding[1]]
+            if "logger" in values:
+                return "factory"
+            return "other" if all(value == "other" for value in values) else None
+        if kind == "class":
+            bases = [
+                self.resolve_reference(module, base, seen) if base is not None else None
+                for base in binding[1]
+            ]
+            if "factory" in bases:
+                return "factory"
+            return "other" if all(base == "other" for base in bases) else None
+        if kind == "other":
+            return "other"
+        return None
+
+    def get_aliases(self, path, source=None):
+        """
+        Classify the module-level names of a file as "logger", "factory" or "other".
+
+        Names that cannot be resolved, such as imports from outside the project or from modules that
+        changed since they were indexed, are left out. If given, `source` is the file's current source.
+
+        """
+        entry = self.modules.get(realpath(path))
+        if entry is None:
+            return {}
+        if source is not None and sha1(source).hexdigest() != entry["digest"]:
+            return {}
+
+        aliases = {}
+        for name in entry["bindings"]:
+            result = self.resolve_name(entry["module"], name, set())
+            if isinstance(result, tuple):
+                if result[1] in LOGGER_MODULES:
+                    aliases[name] = "logger"
+            elif result is not None:
+                aliases[name] = result
+        return aliases
+
+
+def load_logger_index(path):
+    """
+    Load a persisted index once per process, reloading it only if the file changes.
+
+    A missing index is treated as empty, so calls are classified by method name alone.
+
+    """
+    try:
+        modified = stat(path).st_mtime
+    except OSError:
+        return LoggerIndex()
+    loaded = LOADED_INDEXES.get(path)
+    if loaded is None or loaded[0] != modified:
+        loaded = LOADED_INDEXES[path] = (modified, LoggerIndex.load(path))
+    return loaded[1]
+
+
+def update_logger_index(path, paths):
+    """
+    Bring the persisted index at a path up to date with the given source files.
+
+    """
+    index = LoggerIndex.load(path)
+    updated = index.update(paths)
+    index.save(path)
+    return index, updated
@@ -2,7 +2,11 @@
 Flake8 entry point.
 
 """
-from logging_format.visitor import LoggingVisitor
+from logging_format.aliases import load_logger_index
+from logging_format.config import DEFAULT_FIELD_SEVERITIES, parse_field_severities
+from logging_format.guards import FileLimits, GuardedLoggingVisitor, GuardExceeded, scan_lines
+from logging_format.violations import DEGRADED_MODE_VIOLATION
+from logging_format.visitor import DEFAULT_MAX_EXTRA_DEPTH, DEFAULT_MAX_EXTRA_KEYS, LoggingVisitor
 from logging_format.whitelist import Whitelist
 
 
@@ -13,26 +17,101 @@ class LoggingFormatValidator(object):
     name = "logging-format"
     version = __version__
     enable_extra_whitelist = False
+    enable_constant_templates = False
+    enable_logging_flag_opt_outs = False
+    extra_whitelist_snapshot = None
+    whitelist = None
+    max_extra_keys = DEFAULT_MAX_EXTRA_KEYS
+    max_extra_depth = DEFAULT_MAX_EXTRA_DEPTH
+    logger_index = None
+    max_file_bytes = None
+    max_file_nodes = None
+    max_file_seconds = None
+    degraded_mode = "scan"
+    field_severities = DEFAULT_FIELD_SEVERITIES
 
-    def __init__(self, tree, filename):
+    def __init__(self, tree, filename, lines):
         self.tree = tree
+        self.filename = filename
+        self.lines = lines
 
     @classmethod
     def add_options(cls, parser):
         parser.add_option("--enable-extra-whitelist", action="store_true")
+        parser.add_option("--enable-constant-templates", action="store_true", parse_from_config=True)
+        parser.add_option("--enable-logging-flag-opt-outs", action="store_true", parse_from_config=True)
+        parser.add_option("--extra-whitelist-snapshot")
+        parser.add_option("--max-extra-keys", type=int, default=DEFAULT_MAX_EXTRA_KEYS, parse_from_config=True)
+        parser.add_option("--max-extra-depth", type=int, default=DEFAULT_MAX_EXTRA_DEPTH, parse_from_config=True)
+        parser.add_option("--logger-index", parse_from_config=True)
+        parser.add_option("--max-file-bytes", type=int, parse_from_config=True)
+        parser.add_option("--max-file-nodes", type=int, parse_from_config=True)
+        parser.add_option("--max-file-seconds", type=float, parse_from_config=True)
+        parser.add_option("--degraded-mode", choices=("scan", "skip"), default="scan", parse_from_config=True)
+        parser.add_option("--formatter-field-severity", parse_from_config=True)
 
     @classmethod
     def parse_options(cls, options):
         cls.enable_extra_whitelist = options.enable_extra_whitelist
+        cls.enable_constant_templates = options.enable_constant_templates
+        cls.enable_logging_flag_opt_outs = options.enable_logging_flag_opt_outs
+        cls.extra_whitelist_snapshot = options.extra_whitelist_snapshot
+        # resolve the whitelist once per run rather than once per file
+        cls.whitelist = Whitelist(snapshot=cls.extra_whitelist_snapshot) if cls.enable_extra_whitelist else None
+        cls.max_extra_keys = options.max_extra_keys
+        cls.max_extra_depth = options.max_extra_depth
+        cls.logger_index = options.logger_index
+        cls.max_file_bytes = options.max_file_bytes
+        cls.max_file_nodes = options.max_file_nodes
+        cls.max_file_seconds = options.max_file_seconds
+        cls.degraded_mode = options.degraded_mode
+        cls.field_severities = parse_field_severities(options.formatter_field_severity)
 
     def run(self):
-        whitelist = None
+        logger_aliases = None
+        if LoggingFormatValidator.logger_index:
+            logger_aliases = load_logger_index(LoggingFormatValidator.logger_index).get_aliases(
+                self.filename,
+                "".join(self.lines).encode("utf-8"),
+            )
 
-        if LoggingFormatValidator.enable_extra_whitelist:
-            whitelist = Whitelist()
-
-        visitor = LoggingVisitor(whitelist=whitelist)
-        visitor.visit(self.tree)
+        options = dict(
+            whitelist=LoggingFormatValidator.whitelist,
+            max_extra_keys=LoggingFormatValidator.max_extra_keys,
+            max_extra_depth=LoggingFormatValidator.max_extra_depth,
+            logger_aliases=logger_aliases,
+            field_severities=LoggingFormatValidator.field_severities,
+            constant_templates=LoggingFormatValidator.enable_constant_templates,
+            logging_flags=LoggingFormatValidator.enable_logging_flag_opt_outs,
+        )
+        limits = FileLimits(
+            max_bytes=LoggingFormatValidator.max_file_bytes,
+            max_seconds=LoggingFormatValidator.max_file_seconds,
+            max_nodes=LoggingFormatValidator.max_file_nodes,
+        )
+        try:
+            if limits:
+                if limits.max_bytes is not None:
+                    limits.check_source("".join(self.lines).encode("utf-8"))
+                visitor = GuardedLoggingVisitor(limits, **options)
+            else:
+                visitor = LoggingVisitor(**options)
+            visitor.visit(self.tree)
+        except GuardExceeded as error:
+            for violation in self.run_degraded(str(error)):
+                yield violation
+            return
 
         for node, reason in visitor.violations:
             yield node.lineno, node.col_offset, reason, type(self)
+
+    def run_degraded(self, reason):
+        """
+        Report a file that exceeded its limits, falling back to a textual scan unless configured to skip it.
+
+        """
+        mode = LoggingFormatValidator.degraded_mode
+        yield 1, 0, DEGRADED_MODE_VIOLATION.format(mode, reason), type(self)
+        if mode == "scan":
+            for lineno, col_offset, violation in scan_lines(self.lines):
+                yield lineno, col_offset, violation, type(self)
@@ -0,0 +1,86 @@
+"""
+Read python sources directly from wheels, zip files and source distributions.
+
+Members are streamed from the archive without extracting it; each is reported as `archive!member`.
+
+"""
+from os.path import isfile
+from tarfile import open as open_tarfile
+from zipfile import ZipFile
+
+from logging_format.runner import SOURCE_SUFFIX
+
+
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+ZIP_SUFFIXES = (".whl", ".zip")
+
+
+def is_archive(path):
+    return path.endswith(TAR_SUFFIXES + ZIP_SUFFIXES)
+
+
+def member_path(path, name):
+    return "{}!{}".format(path, name)
+
+
+def split_member_path(path):
+    """
+    Split an `archive!member` path into the archive and member name, or return None for other paths.
+
+    The archive is the first prefix that names an archive file, so either part may contain `!`.
+
+    """
+    index = path.find("!")
+    while index != -1:
+        archive = path[:index]
+        if is_archive(archive) and isfile(archive):
+            return archive, path[index + 1:]
+        index = path.find("!", index + 1)
+    return None
+
+
+def read_member(path, name):
+    """
+    Read a single member of an archive.
+
+    """
+    if path.endswith(TAR_SUFFIXES):
+        with open_tarfile(path) as archive:
+            return archive.extractfile(name).read()
+
+    with ZipFile(path) as archive:
+        return archive.read(name)
+
+
+def iter_archive_sources(path):
+    """
+    Yield the path and source of every python member of an archive, in archive order.
+
+    """
+    if path.endswith(TAR_SUFFIXES):
+        # stream mode reads the archive sequentially, without seeking
+        with open_tarfile(path, "r|*") as archive:
+            for member in archive:
+                if member.isfile() and member.name.endswith(SOURCE_SUFFIX):
+                    yield member_path(path, member.name), archive.extractfile(member).read()
+        return
+
+    with ZipFile(path) as archive:
+        for info in archive.infolist():
+            if not info.filename.endswith("/") and info.filename.endswith(SOURCE_SUFFIX):
+                yield member_path(path, info.filename), archive.read(info)
+
+
+def iter_inputs(paths):
+    """
+    Expand files and archives into `(path, source)` inputs.
+
+    Plain files are yielded without their source, to be read by whichever worker checks them.
+
+    """
+    for path in paths:
+        if is_archive(path):
+            for item in iter_archive_sources(path):
+                yield item
+        else:
+            yield path, None
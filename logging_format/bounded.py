@@ -0,0 +1,91 @@
+"""
+Bounded-memory checking of very large modules.
+
+Rather than holding the whole module's AST, each top-level statement is parsed, walked and
+discarded in turn. Loop and except context, and local definitions, never span top-level
+statements. The checks that need the whole module keep only names and positions between
+statements, never nodes, and are run by `finish_module` once every statement is visited.
+
+"""
+from ast import increment_lineno, parse
+from io import BytesIO
+from tokenize import (
+    COMMENT,
+    DEDENT,
+    ENCODING,
+    ENDMARKER,
+    INDENT,
+    NAME,
+    NEWLINE,
+    NL,
+    OP,
+    TokenError,
+    tokenize,
+)
+
+
+# keywords that continue the preceding compound statement
+CLAUSE_KEYWORDS = {"elif", "else", "except", "finally"}
+
+
+def iter_statement_chunks(source):
+    """
+    Split source into top-level statements, yielding their first line number and source text.
+
+    Decorators and the clauses of compound statements are kept with their statement.
+
+    """
+    lines = []
+    buffer = BytesIO(source)
+
+    def readline():
+        line = buffer.readline()
+        lines.append(line)
+        return line
+
+    encoding = "utf-8"
+    starts = []
+    depth = 0
+    line_start = True
+    decorated = False
+
+    for token in tokenize(readline):
+        if token.type == ENCODING:
+            encoding = token.string
+        elif token.type == INDENT:
+            depth += 1
+        elif token.type == DEDENT:
+            depth -= 1
+        elif token.type == NEWLINE:
+            line_start = True
+        elif token.type in (NL, COMMENT, ENDMARKER):
+            continue
+        elif line_start:
+            line_start = False
+            if depth == 0:
+                is_clause = token.type == NAME and token.string in CLAUSE_KEYWORDS
+                if not decorated and not is_clause:
+                    starts.append(token.start[0])
+                decorated = token.type == OP and token.string == "@"
+
+    ends = starts[1:] + [len(lines) + 1]
+    for start, end in zip(starts, ends):
+        yield start, b"".join(lines[start - 1:end - 1]).decode(encoding)
+
+
+def iter_statement_trees(source, path):
+    """
+    Parse each top-level statement of a module, with line numbers relative to the whole module.
+
+    Raises SyntaxError if the source cannot be split into statements.
+
+    """
+    try:
+        chunks = list(iter_statement_chunks(source))
+    except (TokenError, IndentationError) as error:
+        raise SyntaxError(str(error))
+
+    for start, text in chunks:
+        tree = parse(text, path)
+        increment_lineno(tree, start - 1)
+        yield tree
@@ -0,0 +1,82 @@
+"""
+Catalog of constant logging message templates, with stable IDs.
+
+Shipping a template's ID instead of the template itself cuts log bytes; the catalog maps IDs back
+to templates. IDs are derived from the template text alone, so they are stable across runs and
+shared by duplicate templates.
+
+"""
+from hashlib import sha1
+from json import dumps
+from re import compile as compile_regex
+from string import Formatter
+
+from logging_format.inventory import iter_inventory
+
+
+TEMPLATE_ID_LENGTH = 16
+
+# printf-style conversion specifiers, as used by logging's default "%" style (but not "%%")
+PERCENT_PLACEHOLDER = compile_regex(r"%(?:\([^)]*\))?[#0 +-]*(?:\*|\d+)?(?:\.(?:\*|\d+))?[diouxXeEfFgGcrsa%]")
+
+
+def template_id(template):
+    return sha1(template.encode("utf-8")).hexdigest()[:TEMPLATE_ID_LENGTH]
+
+
+def count_placeholders(template):
+    """
+    Count the `%` placeholders of a template, or else its `{}` fields (as used with `extra`).
+
+    """
+    count = sum(1 for match in PERCENT_PLACEHOLDER.findall(template) if match != "%%")
+    if count:
+        return count
+    try:
+        return sum(1 for _, field, _, _ in Formatter().parse(template) if field is not None)
+    except ValueError:
+        return 0
+
+
+def make_record(entry):
+    return dict(
+        id=template_id(entry["template"]),
+        template=entry["template"],
+        level=entry["level"],
+        path=entry["path"],
+        line=entry["line"],
+        placeholders=count_placeholders(entry["template"]),
+        extra_keys=entry["extra_keys"],
+    )
+
+
+def write_catalog(paths, outfile, jobs=1):
+    """
+    Write a catalog record for every constant template as JSON lines, one call site per line.
+
+    Records are written as files are checked, so that only the modules using each template are
+    kept in memory. Returns the templates used in more than one module, as (id, template, paths).
+
+    """
+    modules = {}
+    for entry in iter_inventory(paths, jobs=jobs):
+        if entry["template_kind"] != "constant":
+            continue
+        record = make_record(entry)
+        outfile.write(dumps(record, sort_keys=True))
+        outfile.write("\n")
+        outfile.flush()
+        modules.setdefault(record["id"], (record["template"], set()))[1].add(record["path"])
+
+    return sorted(
+        (identifier, template, sorted(paths))
+        for identifier, (template, paths) in modules.items()
+        if len(paths) > 1
+    )
+
+
+def format_duplicates(duplicates):
+    return "".join(
+        "duplicate template {} in {} modules: {!r} ({})\n".format(identifier, len(paths), template, ", ".join(paths))
+        for identifier, template, paths in duplicates
+    )
@@ -0,0 +1,328 @@
+"""
+Checks for logging configuration: `dictConfig` dictionaries and `fileConfig` INI files.
+
+Much of the cost of logging is decided by configuration rather than at call sites. The same checks
+apply to configuration files (JSON, YAML or INI) and to `dictConfig({...})` literals in python.
+
+"""
+from ast import Dict, List, Tuple, literal_eval, walk
+from configparser import Error as ConfigParserError, RawConfigParser
+from json import loads as load_json
+from re import compile as compile_regex
+
+from logging_format.violations import (
+    CONFIG_DEBUG_LEVEL_VIOLATION,
+    CONFIG_FRAME_FIELD_VIOLATION,
+    CONFIG_NETWORK_HANDLER_VIOLATION,
+)
+
+try:
+    from yaml import YAMLError, safe_load as load_yaml
+except ImportError:
+    YAMLError = ValueError
+    load_yaml = None
+
+
+JSON_SUFFIXES = (".json",)
+YAML_SUFFIXES = (".yaml", ".yml")
+
+# handlers that send each record over the network from the thread that logs it
+NETWORK_HANDLERS = {
+    "DatagramHandler",
+    "HTTPHandler",
+    "SMTPHandler",
+    "SocketHandler",
+    "SysLogHandler",
+}
+# formatter fields that are only known by inspecting the caller's frame
+FRAME_FIELDS = (
+    "filename",
+    "funcName",
+    "lineno",
+    "module",
+    "pathname",
+)
+DEBUG_LEVELS = ("DEBUG", 10, "10")
+
+# severity of formatter fields used in python code: "high" fields cost a frame inspection or a
+# lookup on every record, "low" fields a smaller lookup; fields not listed (or "off") are not reported
+SEVERITIES = ("high", "low", "off")
+DEFAULT_FIELD_SEVERITIES = dict(
+    dict.fromkeys(FRAME_FIELDS, "high"),
+    processName="low",
+    taskName="low",
+    threadName="low",
+)
+# module flags that opt records out of per-record lookups, with the fields that need them
+LOGGING_FLAGS = {
+    "logMultiprocessing": ("processName",),
+    "logProcesses": ("process",),
+    "logThreads": ("thread", "threadName"),
+}
+
+FIELD_PATTERNS = {
+    "%": compile_regex(r"%\((\w+)\)"),
+    "{": compile_regex(r"{(\w+)"),
+    "$": compile_regex(r"\$(?:{(\w+)}|(\w+))"),
+}
+
+
+class ConfigError(Exception):
+    """
+    A logging configuration file could not be read.
+
+    """
+    pass
+
+
+def parse_field_severities(value):
+    """
+    Parse severity overrides such as `asctime:low,lineno:off` onto the default severities.
+
+    Raises ValueError for malformed entries or unknown severities.
+
+    """
+    severities = dict(DEFAULT_FIELD_SEVERITIES)
+    for item in (value or "").split(","):
+        if not item.strip():
+            continue
+        field, _, severity = item.partition(":")
+        if severity.strip() not in SEVERITIES:
+            raise ValueError("expected field:{}, got {!r}".format("|".join(SEVERITIES), item))
+        severities[field.strip()] = severity.strip()
+    return severities
+
+
+def get_class_name(value):
+    """
+    Name a configured class such as `logging.handlers.SMTPHandler` by its last component.
+
+    """
+    if not isinstance(value, str):
+        return None
+    return value.rsplit(".", 1)[-1]
+
+
+def get_format_fields(template, style="%"):
+    """
+    List the record fields used by a format string.
+
+    """
+    pattern = FIELD_PATTERNS.get(style)
+    if pattern is None or not isinstance(template, str):
+        return []
+    return [
+        next(group for group in groups if group) if isinstance(groups, tuple) else groups
+        for groups in pattern.findall(template)
+    ]
+
+
+def is_literal(node):
+    """
+    Is the expression a literal throughout, with no names, calls or other unknown parts?
+
+    """
+    try:
+        literal_eval(node)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def evaluate_literal(node):
+    """
+    Evaluate the literal parts of an expression, leaving anything else as None.
+
+    `dictConfig` literals often refer to names or `ext://` objects; those parts, and keys that
+    cannot be hashed, are skipped rather than rejecting the whole configuration.
+
+    """
+    if isinstance(node, Dict):
+        items = {}
+        for key, value in zip(node.keys, node.values):
+            if key is None:
+                continue
+            key = evaluate_literal(key)
+            try:
+                items[key] = evaluate_literal(value)
+            except TypeError:
+                continue
+        return items
+    if isinstance(node, List):
+        return [evaluate_literal(element) for element in node.elts]
+    if isinstance(node, Tuple):
+        return tuple(evaluate_literal(element) for element in node.elts)
+    try:
+        return literal_eval(node)
+    except (TypeError, ValueError):
+        return None
+
+
+def find_entry_node(node, name):
+    """
+    Find the key that defines an entry within a `dictConfig` literal, falling back to the literal.
+
+    """
+    for child in walk(node):
+        if isinstance(child, Dict):
+            for key in child.keys:
+                if key is not None and evaluate_literal(key) == name:
+                    return key
+    return node
+
+
+def get_formatter_fields(formatter):
+    """
+    List the record fields used by a `dictConfig` formatter entry.
+
+    """
+    template = formatter.get("format", formatter.get("fmt"))
+    return get_format_fields(template, formatter.get("style", "%"))
+
+
+def get_dict_config_fields(config):
+    """
+    Collect the record fields used by all the formatters of a `dictConfig` dictionary.
+
+    """
+    formatters = config.get("formatters") if isinstance(config, dict) else None
+    if not isinstance(formatters, dict):
+        return set()
+    return {
+        field
+        for formatter in formatters.values()
+        if isinstance(formatter, dict)
+        for field in get_formatter_fields(formatter)
+    }
+
+
+def check_dict_config(config):
+    """
+    Check a `dictConfig` dictionary, yielding the name of each offending entry with the violation.
+
+    Handlers run by a configured `QueueHandler`'s listener do not block the logging thread.
+
+    """
+    if not isinstance(config, dict):
+        return
+
+    handlers = config.get("handlers")
+    handlers = handlers if isinstance(handlers, dict) else {}
+    queued = set()
+    for handler in handlers.values():
+        if isinstance(handler, dict) and get_class_name(handler.get("class")) == "QueueHandler":
+            if isinstance(handler.get("handlers"), list):
+                queued.update(name for name in handler["handlers"] if isinstance(name, str))
+
+    for name, handler in sorted(handlers.items(), key=lambda item: str(item[0])):
+        if not isinstance(handler, dict) or name in queued:
+            continue
+        class_name = get_class_name(handler.get("class"))
+        if class_name in NETWORK_HANDLERS:
+            yield name, CONFIG_NETWORK_HANDLER_VIOLATION.format("{} ({})".format(name, class_name))
+
+    loggers = config.get("loggers")
+    loggers = dict(loggers) if isinstance(loggers, dict) else {}
+    if isinstance(config.get("root"), dict):
+        loggers["root"] = config["root"]
+    for name, logger in sorted(loggers.items(), key=lambda item: str(item[0])):
+        if isinstance(logger, dict) and logger.get("level") in DEBUG_LEVELS:
+            yield name, CONFIG_DEBUG_LEVEL_VIOLATION.format(name)
+
+    formatters = config.get("formatters")
+    formatters = formatters if isinstance(formatters, dict) else {}
+    for name, formatter in sorted(formatters.items(), key=lambda item: str(item[0])):
+        if not isinstance(formatter, dict):
+            continue
+        fields = get_formatter_fields(formatter)
+        frame_fields = [field for field in FRAME_FIELDS if field in fields]
+        if frame_fields:
+            yield name, CONFIG_FRAME_FIELD_VIOLATION.format("{} ({})".format(name, ", ".join(frame_fields)))
+
+
+def check_file_config(parser):
+    """
+    Check a `fileConfig` INI file, yielding the section of each offending entry with the violation.
+
+    """
+    def get_keys(section):
+        if not parser.has_option(section, "keys"):
+            return []
+        return [key.strip() for key in parser.get(section, "keys").split(",") if key.strip()]
+
+    for name in get_keys("handlers"):
+        section = "handler_{}".format(name)
+        if parser.has_option(section, "class"):
+            class_name = get_class_name(parser.get(section, "class"))
+            if class_name in NETWORK_HANDLERS:
+                yield section, CONFIG_NETWORK_HANDLER_VIOLATION.format("{} ({})".format(name, class_name))
+
+    for name in get_keys("loggers"):
+        section = "logger_{}".format(name)
+        if parser.has_option(section, "level") and parser.get(section, "level").strip() in DEBUG_LEVELS:
+            yield section, CONFIG_DEBUG_LEVEL_VIOLATION.format(name)
+
+    for name in get_keys("formatters"):
+        section = "formatter_{}".format(name)
+        if not parser.has_option(section, "format"):
+            continue
+        style = parser.get(section, "style") if parser.has_option(section, "style") else "%"
+        fields = get_format_fields(parser.get(section, "format"), style)
+        frame_fields = [field for field in FRAME_FIELDS if field in fields]
+        if frame_fields:
+            yield section, CONFIG_FRAME_FIELD_VIOLATION.format("{} ({})".format(name, ", ".join(frame_fields)))
+
+
+def find_line(lines, needles):
+    """
+    Find the line an entry is defined on: the first line with the first needle found, or the first line.
+
+    """
+    for needle in needles:
+        for index, line in enumerate(lines):
+            if needle in line:
+                return index + 1
+    return 1
+
+
+def load_config(path):
+    """
+    Read a logging configuration file, returning its text and either a dictionary or an INI parser.
+
+    """
+    with open(path) as infile:
+        text = infile.read()
+
+    try:
+        if path.endswith(JSON_SUFFIXES):
+            return text, load_json(text)
+        if path.endswith(YAML_SUFFIXES):
+            if load_yaml is None:
+                raise ConfigError("PyYAML is required to check YAML configuration")
+            return text, load_yaml(text)
+
+        parser = RawConfigParser()
+        parser.read_string(text, path)
+        return text, parser
+    except (ConfigParserError, ValueError, YAMLError) as error:
+        raise ConfigError(str(error))
+
+
+def check_config_path(path):
+    """
+    Check a logging configuration file, yielding the line of each violation with the violation.
+
+    Raises ConfigError if the file cannot be read.
+
+    """
+    text, config = load_config(path)
+    lines = text.splitlines()
+
+    if isinstance(config, RawConfigParser):
+        for section, reason in check_file_config(config):
+            yield find_line(lines, ["[{}]".format(section)]), reason
+        return
+
+    for name, reason in check_dict_config(config):
+        name = str(name)
+        yield find_line(lines, ['"{}":'.format(name), "{}:".format(name), name]), reason
@@ -0,0 +1,216 @@
+"""
+Differential testing of alternative checking engines against the reference visitor.
+
+Engines take a list of `(path, source)` pairs and return the `(line, col, code)` triples
+found for each path. Optimized engines must agree exactly with the reference engine, both on
+randomly generated logging-heavy sources and on a real corpus.
+
+"""
+from functools import partial
+from random import Random
+
+from logging_format.runner import (
+    ResultCache,
+    check_source,
+    imap,
+    iter_python_files,
+    lint_source,
+    read_source,
+)
+
+
+LEVELS = ["debug", "info", "warning", "warn", "error", "exception", "critical"]
+LOGGERS = ["logging", "logger", "log", "self.log", "app.child.log", "parser", "warnings"]
+EXTRA_KEYS = ["world", "user_id", "debug_value", "name", "msg", "taskName"]
+
+
+def to_triples(violations):
+    return sorted((violation["line"], violation["col"], violation["code"]) for violation in violations)
+
+
+def lint_item(item, **kwargs):
+    path, source = item
+    return path, to_triples(lint_source(source, path, **kwargs))
+
+
+def reference_engine(items):
+    return dict(lint_item(item) for item in items)
+
+
+def bounded_engine(items):
+    results = {}
+    for path, source in items:
+        violations = []
+        check_source(source, path, violations, bounded=True)
+        results[path] = to_triples(violations)
+    return results
+
+
+def cached_engine(items):
+    """
+    Check every item twice through a result cache, returning the cached results.
+
+    """
+    cache = ResultCache()
+    for path, source in items:
+        cache.lint(path, source)
+    return {
+        path: to_triples(cache.lint(path, source))
+        for path, source in items
+    }
+
+
+def parallel_engine(items, jobs=2):
+    return dict(imap(lint_item, items, jobs=jobs))
+
+
+ENGINES = dict(
+    bounded=bounded_engine,
+    cached=cached_engine,
+    parallel=parallel_engine,
+)
+
+
+class SourceGenerator(object):
+    """
+    Generate random, syntactically valid python modules that make heavy use of logging.
+
+    """
+    def __init__(self, seed):
+        self.random = Random(seed)
+        self.names = ["world", "item", "value"]
+
+    def choice(self, options):
+        return self.random.choice(options)
+
+    def name(self):
+        return self.choice(self.names)
+
+    def message(self):
+        return self.choice([
+            lambda: '"Hello World"',
+            lambda: '"Hello %s"',
+            lambda: 'f"Hello {{{}}}"'.format(self.name()),
+            lambda: 'f"Hello World"',
+            lambda: '"Hello %s" % {}'.format(self.name()),
+            lambda: '"Hello {{}}".format({})'.format(self.name()),
+            lambda: '"Hello " + str({})'.format(self.name()),
+            lambda: '"Hello {{}}".format(f"{{{}}}")'.format(self.name()),
+            lambda: "msg",
+            lambda: self.name(),
+        ])()
+
+    def extra(self):
+        keys = self.random.sample(EXTRA_KEYS, self.random.randint(1, 3))
+        values = [self.choice([self.name(), '"{}".format(value)', "str(error)", "error"]) for _ in keys]
+        if self.random.random() < 0.5:
+            return "extra=dict({})".format(", ".join("{}={}".format(key, value) for key, value in zip(keys, values)))
+        return "extra={{{}}}".format(", ".join('"{}": {}'.format(key, value) for key, value in zip(keys, values)))
+
+    def logging_call(self):
+        arguments = [self.message()]
+        for _ in range(self.random.randint(0, 2)):
+            arguments.append(self.choice([self.name(), "error", "str(error)", "f\"{value}\"", "len(item)"]))
+        if self.random.random() < 0.4:
+            arguments.append(self.extra())
+        if self.random.random() < 0.2:
+            arguments.append(self.choice(["exc_info=True", "exc_info=False", "exc_info=error", "stack_info=True"]))
+        return "{}.{}({})".format(self.choice(LOGGERS), self.choice(LEVELS), ", ".join(arguments))
+
+    def statement(self):
+        return self.choice([
+            self.logging_call,
+            self.logging_call,
+            lambda: "msg = {}".format(self.message()),
+            lambda: "msg += {}".format(self.name()),
+            lambda: "{} = {}".format(self.name(), self.choice(['"World"', "len(msg)", "msg"])),
+            lambda: "handler = logging.{}()".format(self.choice(["FileHandler", "StreamHandler", "QueueHandler"])),
+            lambda: "logger.addHandler({})".format(self.choice(["handler", "logging.StreamHandler()"])),
+        ])()
+
+    def block(self, indent, depth):
+        lines = []
+        for _ in range(self.random.randint(1, 4)):
+            kind = self.random.random() if depth < 3 else 0
+            prefix = "    " * indent
+            if kind < 0.55:
+                lines.append(prefix + self.statement())
+            elif kind < 0.65:
+                lines.append(prefix + "for {} in items:".format(self.name()))
+                lines.extend(self.block(indent + 1, depth + 1))
+            elif kind < 0.7:
+                lines.append(prefix + "while {}:".format(self.name()))
+                lines.extend(self.block(indent + 1, depth + 1))
+            elif kind < 0.8:
+                lines.append(prefix + "if {}:".format(self.name()))
+                lines.extend(self.block(indent + 1, depth + 1))
+                lines.append(prefix + "else:")
+                lines.extend(self.block(indent + 1, depth + 1))
+            elif kind < 0.93:
+                lines.append(prefix + "try:")
+                lines.extend(self.block(indent + 1, depth + 1))
+                lines.append(prefix + self.choice(["except Exception as error:", "except Exception:"]))
+                lines.extend(self.block(indent + 1, depth + 1))
+            else:
+                lines.append(prefix + "{} {}(self, world, item, value):".format(
+                    self.choice(["def", "async def"]),
+                    self.choice(["handle", "process"]),
+                ))
+                lines.extend(self.block(indent + 1, depth + 1))
+        return lines
+
+    def module(self):
+        lines = ["import logging", "", "logger = logging.getLogger(__name__)", ""]
+        for _ in range(self.random.randint(1, 5)):
+            lines.extend(self.block(0, 0))
+            lines.append("")
+        return "\n".join(lines).encode("utf-8")
+
+
+def generate_sources(count, seed=0):
+    for index in range(count):
+        yield "generated-{}-{}.py".format(seed, index), SourceGenerator("{}-{}".format(seed, index)).module()
+
+
+def iter_corpus(paths):
+    for path in iter_python_files(paths):
+        yield path, read_source(path)
+
+
+def find_mismatches(items, engines=None):
+    """
+    Run every engine over the items and compare each with the reference engine.
+
+    Returns `(path, engine name, expected, actual)` for every disagreement.
+
+    """
+    items = list(items)
+    engines = ENGINES if engines is None else engines
+
+    expected = reference_engine(items)
+    mismatches = []
+    for name, engine in sorted(engines.items()):
+        actual = engine(items)
+        for path, _ in items:
+            if actual.get(path) != expected[path]:
+                mismatches.append((path, name, expected[path], actual.get(path)))
+    return mismatches
+
+
+def check_equivalence(paths, outfile, samples=100, seed=0, jobs=2):
+    """
+    Compare all engines on generated sources and on a corpus, reporting any disagreements.
+
+    """
+    engines = dict(ENGINES, parallel=partial(parallel_engine, jobs=jobs))
+    items = list(generate_sources(samples, seed=seed)) + list(iter_corpus(paths))
+
+    mismatches = find_mismatches(items, engines)
+    for path, name, expected, actual in mismatches:
+        outfile.write("{}: {} engine differs: expected {}, got {}\n".format(path, name, expected, actual))
+    outfile.write("{} sources checked with {} engines, {} mismatches\n".format(
+        len(items),
+        len(engines),
+        len(mismatches),
+    ))
+    return mismatches
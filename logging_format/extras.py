@@ -0,0 +1,166 @@
+"""
+Cardinality report of the `extra` keys used across a repository.
+
+Every new `extra` key becomes a field mapping in the log store; this report counts the keys in use
+so that near-duplicates and clashes can be cleaned up and a whitelist proposed.
+
+"""
+from collections import Counter, defaultdict
+from os.path import abspath, basename, pardir, relpath, sep
+from re import compile as compile_regex
+
+from logging_format.inventory import iter_inventory
+from logging_format.visitor import RESERVED_ATTRS
+
+
+NON_ALPHANUMERIC = compile_regex(r"[^a-z0-9]")
+
+
+def normalize_key(key):
+    """
+    Normalize a key so that spellings such as `user_id`, `userId` and `user-id` compare equal.
+
+    """
+    return NON_ALPHANUMERIC.sub("", key.lower())
+
+
+def get_service(path, roots):
+    """
+    Name the service a file belongs to: the top-level directory below the scanned root.
+
+    """
+    path = abspath(path)
+    for root in roots:
+        root = abspath(root)
+        if path == root:
+            continue
+        parts = relpath(path, root).split(sep)
+        if parts[0] == pardir:
+            continue
+        if len(parts) > 1:
+            return parts[0]
+        return basename(root) or root
+    return basename(path)
+
+
+class ExtraKeyReport(object):
+    """
+    Occurrence counts of extra keys, per key, service and level.
+
+    Memory is bounded by the number of distinct keys rather than the size of the repository.
+
+    """
+    def __init__(self):
+        self.counts = Counter()
+        self.services = defaultdict(Counter)
+        self.levels = defaultdict(Counter)
+
+    def add(self, key, service, level):
+        self.counts[key] += 1
+        self.services[key][service] += 1
+        self.levels[key][level] += 1
+
+    def clashes(self):
+        return sorted(key for key in self.counts if key in RESERVED_ATTRS)
+
+    def near_duplicates(self):
+        """
+        Group keys that differ only in case or separators, most common spelling first.
+
+        """
+        groups = defaultdict(list)
+        for key in self.counts:
+            groups[normalize_key(key)].append(key)
+        return sorted(
+            sorted(keys, key=lambda key: (-self.counts[key], key))
+            for keys in groups.values()
+            if len(keys) > 1
+        )
+
+    def proposed_whitelist(self):
+        """
+        Propose a whitelist: the most common spelling of each key, excluding clashes and debug keys.
+
+        """
+        duplicates = {
+            key
+            for keys in self.near_duplicates()
+            for key in keys[1:]
+        }
+        return sorted(
+            key
+            for key in self.counts
+            if key not in RESERVED_ATTRS and key not in duplicates and not key.startswith("debug_")
+        )
+
+    def to_dict(self):
+        return dict(
+            keys=[
+                dict(
+                    key=key,
+                    count=count,
+                    services=dict(self.services[key]),
+                    levels=dict(self.levels[key]),
+                )
+                for key, count in sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))
+            ],
+            clashes=self.clashes(),
+            near_duplicates=self.near_duplicates(),
+        )
+
+
+def build_report(paths, jobs=1):
+    """
+    Stream the inventory of logging calls under the given paths into an extra key report.
+
+    """
+    report = ExtraKeyReport()
+    for entry in iter_inventory(paths, jobs=jobs):
+        if not entry["extra_keys"]:
+            continue
+        service = get_service(entry["path"], paths)
+        for key in entry["extra_keys"]:
+            report.add(key, service, entry["level"])
+    return report
+
+
+def format_report(report):
+    lines = []
+    for item in report.to_dict()["keys"]:
+        lines.append("{count:>8}  {key}  services={services}  levels={levels}".format(
+            count=item["count"],
+            key=item["key"],
+            services=",".join(sorted(item["services"])),
+            levels=",".join(sorted(item["levels"])),
+        ))
+    for key in report.clashes():
+        lines.append("clash with LogRecord field: {}".format(key))
+    for keys in report.near_duplicates():
+        lines.append("near duplicates: {}".format(", ".join(keys)))
+    return "".join(line + "\n" for line in lines)
+
+
+def format_whitelist_provider(report):
+    """
+    Render a whitelist provider module for the proposed whitelist.
+
+    Register the function under the `logging.extra.whitelist` entry point group to use it.
+
+    """
+    return "".join([
+        '"""\n',
+        "Proposed logging extra whitelist.\n",
+        "\n",
+        "Generated by `python -m logging_format --extra-report`.\n",
+        "\n",
+        '"""\n',
+        "\n",
+        "\n",
+        "def whitelist():\n",
+        "    return [\n",
+    ] + [
+        '        {!r},\n'.format(key)
+        for key in report.proposed_whitelist()
+    ] + [
+        "    ]\n",
+    ])
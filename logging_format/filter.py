@@ -0,0 +1,64 @@
+"""
+Runtime enforcement of the logging extra keyword argument whitelist.
+
+The static checks only see literal `extra` dictionaries and keywords; this filter validates
+the fields that actually reach a `LogRecord`, including keys that were built dynamically.
+
+"""
+from collections import Counter
+from logging import Filter, LogRecord
+from random import random
+
+from logging_format.whitelist import Whitelist
+
+
+# attributes that every LogRecord carries on this interpreter; anything else came from `extra`
+STANDARD_ATTRS = frozenset(vars(LogRecord("", 0, "", 0, "", (), None))) | frozenset(("asctime", "message"))
+
+
+class WhitelistFilter(Filter):
+    """
+    A logging filter that validates `extra` fields against a whitelist.
+
+    Only a `sample_rate` fraction of records is inspected so the filter can run in production
+    with bounded overhead. Violations are counted per key; records are only rejected when
+    `drop` is set.
+
+    """
+    def __init__(self, name="", whitelist=None, sample_rate=1.0, drop=False):
+        super(WhitelistFilter, self).__init__(name)
+        if whitelist is None:
+            whitelist = Whitelist()
+        self.legal_keys = frozenset(whitelist)
+        self.sample_rate = sample_rate
+        self.drop = drop
+        self.checked = 0
+        self.violations = Counter()
+
+    def filter(self, record):
+        if not super(WhitelistFilter, self).filter(record):
+            return False
+
+        if self.sample_rate < 1.0 and random() >= self.sample_rate:
+            return True
+
+        self.checked += 1
+
+        extra_keys = record.__dict__.keys() - STANDARD_ATTRS
+        if not extra_keys:
+            return True
+
+        # mirror the static check: debug records and debug_ keys are not whitelisted
+        if record.levelname == "DEBUG":
+            return True
+
+        illegal_keys = [
+            key
+            for key in extra_keys - self.legal_keys
+            if not key.startswith("debug_")
+        ]
+        if not illegal_keys:
+            return True
+
+        self.violations.update(illegal_keys)
+        return not self.drop
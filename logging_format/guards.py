@@ -0,0 +1,107 @@
+"""
+Per-file limits that keep a single pathological file from stalling a scan.
+
+"""
+from re import compile as compile_regex
+from time import perf_counter
+
+from logging_format.violations import FSTRING_VIOLATION, STRING_FORMAT_VIOLATION
+from logging_format.visitor import LOGGING_LEVELS, LoggingVisitor
+
+
+# a logging call on a single line, and the eager formatting a textual scan can still recognize
+LOGGING_CALL = compile_regex(r"\.({})\(".format("|".join(sorted(LOGGING_LEVELS))))
+# an f-string with at least one replacement field; `{{` is a literal brace
+FSTRING = compile_regex(r"""(?<![\w"'])[rR]?[fF][rR]?(["'])(?:(?!\1)[^{\\]|\\[^{]|\\(?={)|{{)*{(?!{)""")
+# a string literal whose `format` method is called
+FORMAT_CALL = compile_regex(r"""[rRuU]?(["'])(?:(?!\1)[^\\]|\\.)*\1\s*\.format\(""")
+WHITESPACE = compile_regex(r"\s*")
+
+
+class GuardExceeded(Exception):
+    """
+    A file exceeded one of its configured limits.
+
+    """
+    pass
+
+
+class FileLimits(object):
+    """
+    Limits on the size of a file, and on the number of nodes and time spent walking it.
+
+    Any limit left as None is not enforced.
+
+    """
+    def __init__(self, max_bytes=None, max_seconds=None, max_nodes=None):
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.max_nodes = max_nodes
+
+    def __bool__(self):
+        return self.max_bytes is not None or self.max_seconds is not None or self.max_nodes is not None
+
+    __nonzero__ = __bool__
+
+    def check_source(self, source):
+        if self.max_bytes is not None and len(source) > self.max_bytes:
+            raise GuardExceeded("source is {} bytes, limit is {}".format(len(source), self.max_bytes))
+
+    def start(self):
+        """
+        Start the clock for a walk, returning the deadline.
+
+        """
+        if self.max_seconds is None:
+            return None
+        return perf_counter() + self.max_seconds
+
+    def check_deadline(self, deadline):
+        if deadline is not None and perf_counter() > deadline:
+            raise GuardExceeded("walk exceeded {} seconds".format(self.max_seconds))
+
+    def check_nodes(self, nodes):
+        if self.max_nodes is not None and nodes > self.max_nodes:
+            raise GuardExceeded("walk exceeded {} nodes".format(self.max_nodes))
+
+
+class GuardedLoggingVisitor(LoggingVisitor):
+    """
+    A logging visitor that stops once its walk exceeds the configured limits.
+
+    Limits are checked every `check_interval` nodes to keep the overhead low.
+
+    """
+    check_interval = 1024
+
+    def __init__(self, limits, **kwargs):
+        super(GuardedLoggingVisitor, self).__init__(**kwargs)
+        self.limits = limits
+        self.deadline = limits.start()
+        self.nodes = 0
+
+    def visit(self, node):
+        self.nodes += 1
+        if self.nodes % self.check_interval == 0:
+            self.limits.check_deadline(self.deadline)
+            self.limits.check_nodes(self.nodes)
+        return super(GuardedLoggingVisitor, self).visit(node)
+
+
+def scan_lines(lines):
+    """
+    Cheaply scan source lines for f-strings and `str.format` calls in single-line logging calls.
+
+    Only the first argument, the template, is checked. A fallback for files too large to walk;
+    multi-line calls and formatted variables are missed.
+
+    """
+    for index, line in enumerate(lines):
+        call = LOGGING_CALL.search(line)
+        if call is None:
+            continue
+        start = WHITESPACE.match(line, call.end()).end()
+        if FSTRING.match(line, start):
+            yield index + 1, start, FSTRING_VIOLATION
+        elif FORMAT_CALL.match(line, start):
+            yield index + 1, start, STRING_FORMAT_VIOLATION
@@ -0,0 +1,185 @@
+"""
+Profile-guided prioritization of violations.
+
+Violations are annotated with the call count of their enclosing function, taken from `cProfile`
+(pstats) dumps or, failing that, whether coverage.py saw the function run at all, so that the
+eager formatting in the hottest code can be fixed first.
+
+"""
+from ast import AsyncFunctionDef, FunctionDef, walk
+from os.path import isabs, normpath, realpath, sep
+from pstats import Stats
+from sqlite3 import OperationalError, connect
+
+from logging_format.archives import read_member, split_member_path
+from logging_format.runner import parse_source, read_source
+
+
+def numbits_to_lines(numbits):
+    """
+    Decode coverage.py's bitmap of line numbers.
+
+    """
+    return {
+        index * 8 + bit
+        for index, byte in enumerate(bytearray(numbits))
+        for bit in range(8)
+        if byte & (1 << bit)
+    }
+
+
+def query(connection, sql):
+    """
+    Run a query against a coverage.py data file, tolerating tables that older schemas lack.
+
+    """
+    try:
+        return connection.execute(sql).fetchall()
+    except OperationalError:
+        return []
+
+
+def read_any_source(path):
+    """
+    Read the source of a file, or of an `archive!member` path reported for an archive.
+
+    """
+    member = split_member_path(path)
+    if member is not None:
+        return read_member(*member)
+    return read_source(path)
+
+
+def get_last_line(node):
+    """
+    Find the last line of a node; `end_lineno` is only recorded from python 3.8.
+
+    """
+    end_lineno = getattr(node, "end_lineno", None)
+    if end_lineno is not None:
+        return end_lineno
+    return max(getattr(child, "lineno", node.lineno) for child in walk(node))
+
+
+def get_function_ranges(tree):
+    """
+    List the functions in a module with the lines they span, innermost functions last.
+
+    Each function is described by its name, the lines it may be reported at by a profiler
+    (its `def` and first decorator), the first line of its body and its last line.
+
+    """
+    functions = []
+    for node in walk(tree):
+        if isinstance(node, (FunctionDef, AsyncFunctionDef)):
+            first_lines = {node.lineno} | {decorator.lineno for decorator in node.decorator_list}
+            functions.append((node.name, min(first_lines), first_lines, node.body[0].lineno, get_last_line(node)))
+    return sorted(functions, key=lambda function: (function[1], -function[4]))
+
+
+def find_enclosing_function(functions, line):
+    enclosing = None
+    for function in functions:
+        if function[1] <= line <= function[4]:
+            enclosing = function
+    return enclosing
+
+
+class HotnessIndex(object):
+    """
+    Call counts per function, keyed by the real path of the profiled file.
+
+    """
+    def __init__(self):
+        self.calls = {}
+        self.executed_lines = {}
+        self.resolved = {}
+
+    def add_profile(self, path):
+        for (filename, lineno, name), (_, calls, _, _, _) in Stats(path).stats.items():
+            counts = self.calls.setdefault(realpath(filename), {})
+            counts[(lineno, name)] = counts.get((lineno, name), 0) + calls
+
+    def add_coverage(self, path):
+        """
+        Read the lines executed according to a coverage.py data file.
+
+        """
+        connection = connect(path)
+        try:
+            files = dict(query(connection, "select id, path from file"))
+            for file_id, numbits in query(connection, "select file_id, numbits from line_bits"):
+                self.executed_lines.setdefault(realpath(files[file_id]), set()).update(numbits_to_lines(numbits))
+            for file_id, from_line, to_line in query(connection, "select file_id, fromno, tono from arc"):
+                lines = self.executed_lines.setdefault(realpath(files[file_id]), set())
+                lines.update(line for line in (from_line, to_line) if line > 0)
+        finally:
+            connection.close()
+
+    def resolve(self, data, path):
+        """
+        Find the data for a path, by real path or else, for relative paths, by a matching suffix.
+
+        Profiles are often recorded on another machine or in another checkout.
+
+        """
+        key = (id(data), path)
+        if key not in self.resolved:
+            self.resolved[key] = self.find_profiled_path(data, path)
+        profiled_path = self.resolved[key]
+        return data[profiled_path] if profiled_path is not None else None
+
+    def find_profiled_path(self, data, path):
+        resolved = realpath(path)
+        if resolved in data or isabs(path):
+            return resolved if resolved in data else None
+
+        suffix = sep + normpath(path)
+        for profiled_path in data:
+            if profiled_path.endswith(suffix):
+                return profiled_path
+        return None
+
+    def get_calls(self, path, function):
+        name, _, first_lines, body_line, last_line = function
+
+        counts = self.resolve(self.calls, path)
+        if counts is not None:
+            calls = sum(counts.get((line, name), 0) for line in first_lines)
+            if calls:
+                return calls
+
+        executed = self.resolve(self.executed_lines, path)
+        if executed is not None and any(line in executed for line in range(body_line, last_line + 1)):
+            return 1
+        return 0 if counts is not None or executed is not None else None
+
+
+def annotate_violations(violations, index):
+    """
+    Annotate violations with the name and call count of their enclosing function.
+
+    Functions without profile data have a call count of None.
+
+    """
+    functions_by_path = {}
+    for violation in violations:
+        path = violation["path"]
+        if path not in functions_by_path:
+            tree = parse_source(read_any_source(path), path)
+            functions_by_path[path] = get_function_ranges(tree) if tree is not None else []
+
+        function = find_enclosing_function(functions_by_path[path], violation["line"])
+        violation["function"] = function[0] if function is not None else None
+        violation["calls"] = index.get_calls(path, function) if function is not None else None
+    return violations
+
+
+def prioritize(violations, min_calls=None):
+    """
+    Sort violations by estimated hotness, hottest first, optionally dropping cold ones.
+
+    """
+    if min_calls is not None:
+        violations = [violation for violation in violations if (violation["calls"] or 0) >= min_calls]
+    return sorted(violations, key=lambda violation: 1 if violation["calls"] is None else -violation["calls"])
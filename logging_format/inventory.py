@@ -0,0 +1,146 @@
+"""
+Static inventory of logging call sites.
+
+"""
+from ast import (
+    Attribute,
+    BinOp,
+    Call,
+    JoinedStr,
+    Name,
+)
+from json import dumps
+
+from logging_format.runner import (
+    imap,
+    iter_python_files,
+    parse_source,
+    read_source,
+)
+from logging_format.visitor import LoggingVisitor, get_extra_items, get_module_constants, get_template_value
+
+
+def describe_expression(node):
+    """
+    Render a logger expression such as `self.log` or `logging.getLogger()` as a dotted name.
+
+    """
+    if isinstance(node, Name):
+        return node.id
+    if isinstance(node, Attribute):
+        return "{}.{}".format(describe_expression(node.value), node.attr)
+    if isinstance(node, Call):
+        return "{}()".format(describe_expression(node.func))
+    return "<{}>".format(type(node).__name__)
+
+
+def describe_template(node, template=None):
+    """
+    Classify the message argument of a logging call, given the constant template it resolves to, if any.
+
+    Returns the kind of template and, for constant templates, the template itself.
+
+    """
+    if node is None:
+        return "missing", None
+
+    if template is None:
+        template = get_template_value(node)
+    if template is not None:
+        return "constant", template
+    if isinstance(node, JoinedStr):
+        return "f-string", None
+    if isinstance(node, BinOp):
+        return "expression", None
+    if isinstance(node, Call):
+        return "call", None
+    return "variable", None
+
+
+def get_extra_keys(node):
+    """
+    List the literal keys of the `extra` argument of a logging call.
+
+    """
+    for keyword in node.keywords:
+        if keyword.arg != "extra":
+            continue
+        return [key for key, _ in get_extra_items(keyword.value) or ()]
+    return []
+
+
+class InventoryVisitor(LoggingVisitor):
+    """
+    Collect every logging call site detected by the logging visitor.
+
+    """
+    def __init__(self, path=None, whitelist=None):
+        super(InventoryVisitor, self).__init__(whitelist=whitelist)
+        self.path = path
+        self.entries = []
+
+    def visit_Module(self, node):
+        # constant templates are resolved as for the constant template rule, wherever constants are defined
+        self.module_constants = get_module_constants(node.body)
+        super(InventoryVisitor, self).visit_Module(node)
+
+    def visit_Call(self, node):
+        if not self.within_logging_statement():
+            level = self.detect_logging_level(node)
+            if level is not None:
+                self.entries.append(self.make_entry(node, level))
+
+        super(InventoryVisitor, self).visit_Call(node)
+
+    def make_entry(self, node, level):
+        message = node.args[0] if node.args else None
+        kind, template = describe_template(message, self.resolve_template(message) if message is not None else None)
+        return dict(
+            path=self.path,
+            line=node.lineno,
+            col=node.col_offset,
+            level=level,
+            logger=describe_expression(node.func.value),
+            template_kind=kind,
+            template=template,
+            extra_keys=get_extra_keys(node),
+            in_loop=self.within_loop(),
+            in_except=self.within_except_block(),
+        )
+
+
+def inventory_source(source, path):
+    tree = parse_source(source, path)
+    if tree is None:
+        return []
+
+    visitor = InventoryVisitor(path=path)
+    visitor.visit(tree)
+    return visitor.entries
+
+
+def inventory_path(path):
+    return inventory_source(read_source(path), path)
+
+
+def iter_inventory(paths, jobs=1):
+    """
+    Stream inventory entries for every logging call site under the given paths.
+
+    """
+    for entries in imap(inventory_path, iter_python_files(paths), jobs=jobs):
+        for entry in entries:
+            yield entry
+
+
+def write_inventory(paths, outfile, jobs=1):
+    """
+    Write the inventory as JSON lines, one call site per line.
+
+    """
+    count = 0
+    for entry in iter_inventory(paths, jobs=jobs):
+        outfile.write(dumps(entry, sort_keys=True))
+        outfile.write("\n")
+        count += 1
+    return count
@@ -0,0 +1,373 @@
+"""
+Command line entry point for running checks outside of flake8.
+
+"""
+from argparse import ArgumentParser
+from functools import partial
+from json import dump, load
+from sys import stderr, stdout
+
+from logging_format.aliases import update_logger_index
+from logging_format.archives import iter_inputs
+from logging_format.catalog import format_duplicates, write_catalog
+from logging_format.config import ConfigError, check_config_path, parse_field_severities
+from logging_format.equivalence import check_equivalence
+from logging_format.extras import build_report, format_report, format_whitelist_provider
+from logging_format.guards import FileLimits
+from logging_format.hotness import HotnessIndex, annotate_violations, prioritize
+from logging_format.inventory import write_inventory
+from logging_format.runner import (
+    format_violation,
+    check_input,
+    imap,
+    iter_python_files,
+    make_violation,
+)
+from logging_format.shard import (
+    merge_results,
+    parse_shard,
+    select_shard,
+)
+from logging_format.staged import lint_staged
+from logging_format.visitor import DEFAULT_MAX_EXTRA_DEPTH, DEFAULT_MAX_EXTRA_KEYS
+from logging_format.watch import watch
+from logging_format.whitelist import Whitelist, write_snapshot
+
+
+def make_parser():
+    parser = ArgumentParser(
+        prog="python -m logging_format",
+        description="Validate (lack of) logging format strings",
+    )
+    parser.add_argument("paths", nargs="*", metavar="PATH")
+    parser.add_argument("--jobs", type=int, default=1, help="Number of worker processes")
+    parser.add_argument("--enable-extra-whitelist", action="store_true")
+    parser.add_argument(
+        "--enable-constant-templates",
+        action="store_true",
+        help="Report message templates that are not constant, and so cannot be catalogued",
+    )
+    parser.add_argument(
+        "--enable-logging-flag-opt-outs",
+        action="store_true",
+        help="Report modules that configure logging but keep logging flags their formatters do not use",
+    )
+    parser.add_argument("--max-extra-keys", type=int, default=DEFAULT_MAX_EXTRA_KEYS)
+    parser.add_argument("--max-extra-depth", type=int, default=DEFAULT_MAX_EXTRA_DEPTH)
+    parser.add_argument(
+        "--formatter-field-severity",
+        type=parse_field_severities,
+        metavar="FIELD:SEVERITY,...",
+        help="Override the severity (high, low or off) of formatter fields",
+    )
+    parser.add_argument(
+        "--logger-index",
+        metavar="FILE",
+        help="Index loggers across modules, persisted in this file, to classify logging calls precisely",
+    )
+    parser.add_argument(
+        "--extra-whitelist-snapshot",
+        metavar="FILE",
+        help="Read the extra whitelist from this snapshot while it is up to date",
+    )
+
+    modes = parser.add_mutually_exclusive_group()
+    modes.add_argument(
+        "--write-whitelist-snapshot",
+        metavar="FILE",
+        help="Resolve all extra whitelist providers once and write their keys to a snapshot",
+    )
+    modes.add_argument(
+        "--inventory",
+        action="store_true",
+        help="Write an inventory of logging call sites as JSON lines instead of checking them",
+    )
+    modes.add_argument(
+        "--catalog",
+        action="store_true",
+        help="Write a catalog of constant message templates, with stable IDs, as JSON lines",
+    )
+    modes.add_argument(
+        "--extra-report",
+        action="store_true",
+        help="Report how often each extra key is used, per service and level",
+    )
+    modes.add_argument(
+        "--staged",
+        action="store_true",
+        help="Check the content staged in git, optionally limited to PATHs",
+    )
+    modes.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and relint files as they change",
+    )
+    modes.add_argument(
+        "--logging-config",
+        action="store_true",
+        help="Check logging configuration files (dictConfig JSON or YAML, fileConfig INI), given as paths",
+    )
+    modes.add_argument(
+        "--merge",
+        action="store_true",
+        help="Combine JSON results from several shards, given as paths",
+    )
+    modes.add_argument(
+        "--equivalence",
+        action="store_true",
+        help="Check that the optimized engines agree with the reference visitor on generated sources and PATHs",
+    )
+
+    parser.add_argument("--format", choices=("text", "json"), default="text", help="Output format")
+    parser.add_argument("--shard", type=parse_shard, metavar="i/n", help="Only check the i-th of n balanced shards")
+    parser.add_argument("--timings", metavar="FILE", help="JSON results of a previous run, used to balance shards")
+    parser.add_argument(
+        "--bounded-memory",
+        action="store_true",
+        help="Parse and check top-level statements one at a time instead of holding whole modules",
+    )
+    parser.add_argument("--memory-report", action="store_true", help="Report the peak memory allocated per file")
+    parser.add_argument("--max-file-bytes", type=int, help="Skip files larger than this")
+    parser.add_argument("--max-file-seconds", type=float, help="Stop checking a file after this long")
+    parser.add_argument("--max-file-nodes", type=int, help="Stop checking a file after walking this many nodes")
+    parser.add_argument(
+        "--profile",
+        action="append",
+        default=[],
+        metavar="FILE",
+        help="cProfile/pstats dump used to order violations by how often their function runs (repeatable)",
+    )
+    parser.add_argument(
+        "--coverage-data",
+        action="append",
+        default=[],
+        metavar="FILE",
+        help="coverage.py data file used to tell functions that ran from those that did not (repeatable)",
+    )
+    parser.add_argument("--min-calls", type=int, help="With --profile or --coverage-data, drop colder violations")
+
+    parser.add_argument(
+        "--whitelist-provider",
+        metavar="FILE",
+        help="With --extra-report, also write a whitelist provider module for the proposed whitelist",
+    )
+    parser.add_argument("--samples", type=int, default=100, help="Number of generated sources to compare")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for generated sources")
+    parser.add_argument("--debounce", type=float, default=0.2, help="Seconds to wait for a burst of saves to settle")
+    parser.add_argument("--poll", action="store_true", help="Poll for changes instead of using inotify")
+    return parser
+
+
+def make_visitor_options(args):
+    whitelist = None
+    if args.enable_extra_whitelist:
+        whitelist = Whitelist(snapshot=args.extra_whitelist_snapshot)
+
+    options = dict(
+        whitelist=whitelist,
+        max_extra_keys=args.max_extra_keys,
+        max_extra_depth=args.max_extra_depth,
+        constant_templates=args.enable_constant_templates,
+        logging_flags=args.enable_logging_flag_opt_outs,
+    )
+    if args.logger_index:
+        options.update(logger_index=args.logger_index)
+    if args.formatter_field_severity is not None:
+        options.update(field_severities=args.formatter_field_severity)
+    return options
+
+
+def load_results(path):
+    with open(path) as infile:
+        return load(infile)
+
+
+def write_violations(violations):
+    for violation in violations:
+        stdout.write(format_violation(violation))
+        stdout.write("\n")
+    stdout.flush()
+
+
+def write_results(result, output_format, streamed=False):
+    """
+    Write the results of a run; in text format, violations already streamed are not repeated.
+
+    """
+    if output_format == "json":
+        dump(result, stdout, sort_keys=True)
+        stdout.write("\n")
+        return
+
+    if not streamed:
+        write_violations(result["violations"])
+    for path, reason in sorted(result.get("skipped", {}).items()):
+        stderr.write("{}: skipped: {}\n".format(path, reason))
+    for path, peak in sorted(result.get("memory", {}).items(), key=lambda item: -item[1]):
+        stderr.write("{}: peak memory {:.1f} KiB\n".format(path, peak / 1024.0))
+
+
+def make_hotness_index(args):
+    if not args.profile and not args.coverage_data:
+        return None
+
+    index = HotnessIndex()
+    for path in args.profile:
+        index.add_profile(path)
+    for path in args.coverage_data:
+        index.add_coverage(path)
+    return index
+
+
+def lint(args):
+    limits = FileLimits(
+        max_bytes=args.max_file_bytes,
+        max_seconds=args.max_file_seconds,
+        max_nodes=args.max_file_nodes,
+    )
+
+    if args.logger_index:
+        # index every module, not just this shard, so that imports can be followed
+        update_logger_index(args.logger_index, iter_python_files(args.paths))
+
+    paths = iter_python_files(args.paths)
+    if args.shard is not None:
+        timings = load_results(args.timings).get("timings") if args.timings else None
+        paths = select_shard(paths, *args.shard, timings=timings)
+
+    check = partial(
+        check_input,
+        bounded=args.bounded_memory,
+        limits=limits,
+        memory=args.memory_report,
+        **make_visitor_options(args)
+    )
+    result = dict(files=0, timings={}, violations=[], skipped={})
+    if args.memory_report:
+        result["memory"] = {}
+
+    # text output is written as each file is done, unless violations are to be reordered by hotness
+    index = make_hotness_index(args)
+    streamed = args.format == "text" and index is None
+
+    for file_result in imap(check, iter_inputs(paths), jobs=args.jobs):
+        path = file_result["path"]
+        result["files"] += 1
+        result["timings"][path] = file_result["seconds"]
+        result["violations"].extend(file_result["violations"])
+        if streamed:
+            write_violations(file_result["violations"])
+        if file_result["skipped"] is not None:
+            result["skipped"][path] = file_result["skipped"]
+        if args.memory_report:
+            result["memory"][path] = file_result["peak_memory"]
+
+    if index is not None:
+        result["violations"] = prioritize(
+            annotate_violations(result["violations"], index),
+            min_calls=args.min_calls,
+        )
+
+    write_results(result, args.format, streamed=streamed)
+    return 1 if result["violations"] else 0
+
+
+def logging_config(args):
+    result = dict(files=0, violations=[], skipped={})
+
+    for path in args.paths:
+        result["files"] += 1
+        try:
+            result["violations"].extend(
+                make_violation(path, line, 0, reason)
+                for line, reason in check_config_path(path)
+            )
+        except (ConfigError, IOError) as error:
+            result["skipped"][path] = str(error)
+
+    write_results(result, args.format)
+    return 1 if result["violations"] else 0
+
+
+def merge(args):
+    result = merge_results(load_results(path) for path in args.paths)
+
+    write_results(result, args.format)
+    return 1 if result["violations"] else 0
+
+
+def inventory(args):
+    write_inventory(args.paths, stdout, jobs=args.jobs)
+    return 0
+
+
+def catalog(args):
+    duplicates = write_catalog(args.paths, stdout, jobs=args.jobs)
+    stderr.write(format_duplicates(duplicates))
+    return 0
+
+
+def extra_report(args):
+    report = build_report(args.paths, jobs=args.jobs)
+
+    if args.format == "json":
+        dump(report.to_dict(), stdout, sort_keys=True)
+        stdout.write("\n")
+    else:
+        stdout.write(format_report(report))
+
+    if args.whitelist_provider:
+        with open(args.whitelist_provider, "w") as outfile:
+            outfile.write(format_whitelist_provider(report))
+    return 0
+
+
+def watch_paths(args):
+    watch(args.paths, stdout, debounce=args.debounce, polling=args.poll, **make_visitor_options(args))
+    return 0
+
+
+def equivalence(args):
+    mismatches = check_equivalence(args.paths, stdout, samples=args.samples, seed=args.seed, jobs=max(args.jobs, 2))
+    return 1 if mismatches else 0
+
+
+def staged(args):
+    violations = lint_staged(pathspecs=args.paths, **make_visitor_options(args))
+
+    write_results(dict(violations=violations), args.format)
+    return 1 if violations else 0
+
+
+def snapshot(args):
+    legal_keys = write_snapshot(args.write_whitelist_snapshot)
+    stdout.write("Wrote {} whitelisted keys to {}\n".format(len(legal_keys), args.write_whitelist_snapshot))
+    return 0
+
+
+def main(argv=None):
+    parser = make_parser()
+    args = parser.parse_args(argv)
+
+    if args.write_whitelist_snapshot:
+        return snapshot(args)
+    if args.staged:
+        return staged(args)
+    if not args.paths:
+        parser.error("at least one PATH is required")
+
+    if args.inventory:
+        return inventory(args)
+    if args.catalog:
+        return catalog(args)
+    if args.extra_report:
+        return extra_report(args)
+    if args.watch:
+        return watch_paths(args)
+    if args.logging_config:
+        return logging_config(args)
+    if args.merge:
+        return merge(args)
+    if args.equivalence:
+        return equivalence(args)
+    return lint(args)
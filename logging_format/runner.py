@@ -0,0 +1,290 @@
+"""
+Standalone runner for scanning source trees without flake8.
+
+"""
+from ast import parse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha1
+from os import walk
+from os.path import isdir, join
+from time import perf_counter
+from tracemalloc import (
+    get_traced_memory,
+    start as start_tracing,
+    stop as stop_tracing,
+)
+
+from logging_format.aliases import load_logger_index
+from logging_format.bounded import iter_statement_trees
+from logging_format.guards import (
+    FileLimits,
+    GuardedLoggingVisitor,
+    GuardExceeded,
+)
+from logging_format.visitor import LoggingVisitor, get_module_constants
+
+
+SOURCE_SUFFIX = ".py"
+
+
+def iter_python_files(paths):
+    """
+    Expand files and directories into python source paths, in a stable order.
+
+    """
+    for path in paths:
+        if not isdir(path):
+            yield path
+            continue
+
+        for dirpath, dirnames, filenames in walk(path):
+            dirnames[:] = sorted(dirname for dirname in dirnames if not dirname.startswith("."))
+            for filename in sorted(filenames):
+                if filename.endswith(SOURCE_SUFFIX):
+                    yield join(dirpath, filename)
+
+
+def read_source(path):
+    with open(path, "rb") as infile:
+        return infile.read()
+
+
+def parse_source(source, path):
+    """
+    Parse a source file, returning None if it is not valid python.
+
+    """
+    try:
+        return parse(source, path)
+    except (SyntaxError, ValueError):
+        return None
+
+
+def imap(function, items, jobs=1):
+    """
+    Apply a function to every item, in order, optionally using a process pool.
+
+    At most twice as many items as there are jobs are in flight at any time, so that items
+    produced lazily (e.g. file contents) are not all held in memory at once.
+
+    """
+    if jobs <= 1:
+        for item in items:
+            yield function(item)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(function, item))
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def make_violation(path, lineno, col_offset, reason):
+    return dict(
+        path=path,
+        line=lineno,
+        col=col_offset,
+        code=reason.split(" ", 1)[0],
+        message=reason,
+    )
+
+
+def collect_violations(visitor, path):
+    """
+    Convert the visitor's violations to plain records, releasing its references to AST nodes.
+
+    """
+    violations = [
+        make_violation(path, node.lineno, node.col_offset, reason)
+        for node, reason in visitor.violations
+    ]
+    del visitor.violations[:]
+    visitor.reported_definitions.clear()
+    return violations
+
+
+def make_visitor(path, limits=None, logger_index=None, **options):
+    """
+    Create a visitor for a path, with the path's logger aliases from the index at `logger_index`, if any.
+
+    Other options are passed to the visitor.
+
+    """
+    if logger_index is not None:
+        options["logger_aliases"] = load_logger_index(logger_index).get_aliases(path)
+    if limits:
+        return GuardedLoggingVisitor(limits, **options)
+    return LoggingVisitor(**options)
+
+
+def lint_tree(tree, path, **options):
+    """
+    Run the logging visitor over a parsed module.
+
+    Options are passed to the visitor.
+
+    """
+    visitor = make_visitor(path, **options)
+    visitor.visit(tree)
+
+    return sorted(collect_violations(visitor, path), key=violation_sort_key)
+
+
+def lint_source(source, path, **options):
+    tree = parse_source(source, path)
+    if tree is None:
+        return []
+    return lint_tree(tree, path, **options)
+
+
+def lint_path(path, **options):
+    return lint_source(read_source(path), path, **options)
+
+
+def check_source(source, path, violations, bounded=False, limits=None, **options):
+    """
+    Check a source file, appending violations as they are found.
+
+    In bounded mode, top-level statements are parsed and walked one at a time. Raises
+    GuardExceeded if the file exceeds its limits; violations found so far are kept.
+
+    """
+    limits = limits or FileLimits()
+    limits.check_source(source)
+
+    visitor = make_visitor(path, limits=limits, **options)
+
+    if not bounded:
+        tree = parse_source(source, path)
+        if tree is not None:
+            try:
+                visitor.visit(tree)
+            finally:
+                violations.extend(collect_violations(visitor, path))
+        return
+
+    deadline = getattr(visitor, "deadline", None)
+    try:
+        if visitor.constant_templates:
+            # constants may be defined after they are used, so collect them in a first pass
+            visitor.module_constants = get_module_constants(
+                statement
+                for tree in iter_statement_trees(source, path)
+                for statement in tree.body
+            )
+        for tree in iter_statement_trees(source, path):
+            try:
+                # visit the statements rather than the partial module, which would finish it
+                for statement in tree.body:
+                    visitor.visit(statement)
+            finally:
+                violations.extend(collect_violations(visitor, path))
+            limits.check_deadline(deadline)
+        visitor.finish_module()
+        violations.extend(collect_violations(visitor, path))
+    except (SyntaxError, ValueError):
+        # not valid python; report nothing, as with a full parse
+        del violations[:]
+
+
+def check_path(path, source=None, bounded=False, limits=None, memory=False, **options):
+    """
+    Check a path, recording the time taken (so that future runs can balance their work) and,
+    optionally, the peak memory allocated. The source is read from the path unless given.
+
+    Files that exceed their limits are reported as skipped rather than failing the run.
+
+    """
+    if memory:
+        start_tracing()
+
+    started = perf_counter()
+    violations = []
+    skipped = None
+    try:
+        if source is None:
+            source = read_source(path)
+        check_source(source, path, violations, bounded=bounded, limits=limits, **options)
+    except GuardExceeded as error:
+        skipped = str(error)
+
+    result = dict(
+        path=path,
+        seconds=perf_counter() - started,
+        skipped=skipped,
+        violations=sorted(violations, key=violation_sort_key),
+    )
+    if memory:
+        result["peak_memory"] = get_traced_memory()[1]
+        stop_tracing()
+    return result
+
+
+def check_input(item, **kwargs):
+    """
+    Check a `(path, source)` input; the source is None for files that are read by the worker.
+
+    """
+    path, source = item
+    return check_path(path, source=source, **kwargs)
+
+
+def violation_sort_key(violation):
+    return violation["path"], violation["line"], violation["col"], violation["code"]
+
+
+def format_violation(violation):
+    line = "{path}:{line}:{col}: {message}".format(
+        path=violation["path"],
+        line=violation["line"],
+        col=violation["col"] + 1,
+        message=violation["message"],
+    )
+    if violation.get("calls") is not None:
+        line += " [calls={} in {}]".format(violation["calls"], violation["function"])
+    return line
+
+
+class ResultCache(object):
+    """
+    Lint results per path, reused for as long as the source is unchanged.
+
+    Keeps a running count of violations so that totals are available without a rescan.
+
+    """
+    def __init__(self, **options):
+        self.options = options
+        self.results = {}
+        self.count = 0
+
+    def lint(self, path, source, digest=None):
+        """
+        Lint a source, unless it is unchanged since it was last linted.
+
+        Callers that already know a content hash, such as a git blob id, may pass it as the digest.
+
+        """
+        if digest is None:
+            digest = sha1(source).hexdigest()
+        cached = self.results.get(path)
+        if cached is not None and cached[0] == digest:
+            return cached[1]
+
+        violations = lint_source(source, path, **self.options)
+        self.discard(path)
+        self.results[path] = (digest, violations)
+        self.count += len(violations)
+        return violations
+
+    def discard(self, path):
+        cached = self.results.pop(path, None)
+        if cached is not None:
+            self.count -= len(cached[1])
+
+    def __len__(self):
+        return len(self.results)
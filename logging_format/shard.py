@@ -0,0 +1,94 @@
+"""
+Balanced sharding of a scan across CI nodes.
+
+Files are partitioned by estimated cost using a greedy longest-processing-time assignment,
+so that every node computes the same partition without coordination.
+
+"""
+from argparse import ArgumentTypeError
+from heapq import heapify, heapreplace
+from os.path import getsize
+
+from logging_format.runner import violation_sort_key
+
+
+def parse_shard(value):
+    """
+    Parse a 1-based `i/n` shard specification.
+
+    """
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ArgumentTypeError("shard must be of the form i/n, got: {}".format(value))
+
+    if not 1 <= index <= count:
+        raise ArgumentTypeError("shard index must be between 1 and {}, got: {}".format(count, index))
+    return index, count
+
+
+def estimate_costs(paths, timings=None):
+    """
+    Estimate the cost of checking each path.
+
+    Uses recorded timings where available. Other files are estimated by size, scaled by the
+    throughput of the timed files so that both estimates are in the same unit.
+
+    """
+    timings = timings or {}
+    sizes = {path: getsize(path) for path in paths}
+
+    timed = [path for path in paths if path in timings]
+    timed_bytes = sum(sizes[path] for path in timed)
+    seconds_per_byte = sum(timings[path] for path in timed) / timed_bytes if timed_bytes else 1.0
+
+    return {
+        path: timings[path] if path in timings else sizes[path] * seconds_per_byte
+        for path in paths
+    }
+
+
+def assign_shards(costs, count):
+    """
+    Assign paths to `count` shards, placing the most expensive remaining path on the least loaded shard.
+
+    Ties are broken by path and shard index so the assignment is deterministic.
+
+    """
+    shards = [[] for _ in range(count)]
+    loads = [(0, index) for index in range(count)]
+    heapify(loads)
+
+    for path in sorted(costs, key=lambda path: (-costs[path], path)):
+        load, index = loads[0]
+        shards[index].append(path)
+        heapreplace(loads, (load + costs[path], index))
+
+    return [sorted(shard) for shard in shards]
+
+
+def select_shard(paths, index, count, timings=None):
+    """
+    Select the paths belonging to the 1-based shard `index` of `count`.
+
+    """
+    paths = list(paths)
+    return assign_shards(estimate_costs(paths, timings), count)[index - 1]
+
+
+def merge_results(results):
+    """
+    Combine per-shard JSON results into a single result.
+
+    """
+    merged = dict(files=0, timings={}, violations=[], skipped={})
+    for result in results:
+        merged["files"] += result.get("files", 0)
+        merged["timings"].update(result.get("timings", {}))
+        merged["violations"].extend(result.get("violations", []))
+        merged["skipped"].update(result.get("skipped", {}))
+        if "memory" in result:
+            merged.setdefault("memory", {}).update(result["memory"])
+
+    merged["violations"].sort(key=violation_sort_key)
+    return merged
@@ -0,0 +1,96 @@
+"""
+Check exactly what is staged, reading sources from the git object store.
+
+Staged blobs are read in bulk through a single long-running `git cat-file --batch` process,
+so pre-commit runs need neither the working tree nor temporary files.
+
+"""
+from subprocess import PIPE, CalledProcessError, Popen, check_output
+from threading import Thread
+
+from logging_format.runner import SOURCE_SUFFIX, ResultCache
+
+
+def get_toplevel(cwd=None):
+    return check_output(["git", "rev-parse", "--show-toplevel"], cwd=cwd).decode().strip()
+
+
+def list_staged_paths(cwd=None, pathspecs=()):
+    """
+    List the python files added, copied, modified or renamed in the index, relative to the top level.
+
+    """
+    output = check_output(
+        ["git", "diff", "--cached", "--name-only", "--diff-filter=ACMR", "-z", "--"] + list(pathspecs),
+        cwd=cwd,
+    )
+    return [
+        path
+        for path in output.decode().split("\0")
+        if path.endswith(SOURCE_SUFFIX) and "\n" not in path
+    ]
+
+
+def iter_staged_blobs(paths, cwd=None):
+    """
+    Read the staged content of each path, yielding its path, blob id and source.
+
+    Requests are written from a separate thread so that git never blocks on a full pipe. If the
+    consumer stops early, git is stopped too and its exit status is ignored.
+
+    """
+    process = Popen(["git", "cat-file", "--batch"], stdin=PIPE, stdout=PIPE, cwd=cwd)
+
+    def write_requests():
+        try:
+            try:
+                for path in paths:
+                    process.stdin.write(":{}\n".format(path).encode())
+            finally:
+                process.stdin.close()
+        except OSError:
+            # git was stopped before reading every request
+            pass
+
+    writer = Thread(target=write_requests)
+    writer.daemon = True
+    writer.start()
+
+    finished = False
+    try:
+        for path in paths:
+            header = process.stdout.readline().decode().split()
+            if header[-1] == "missing":
+                # "<object> missing": nothing staged at this path
+                continue
+            blob_id, _, size = header
+            source = process.stdout.read(int(size))
+            process.stdout.read(1)
+            yield path, blob_id, source
+        finished = True
+    finally:
+        process.stdout.close()
+        if not finished:
+            process.kill()
+        # once git has exited, the writer cannot block on its input
+        returncode = process.wait()
+        writer.join()
+        if finished and returncode != 0:
+            raise CalledProcessError(returncode, "git cat-file --batch")
+
+
+def lint_staged(cwd=None, pathspecs=(), cache=None, **options):
+    """
+    Lint the staged content of every staged python file.
+
+    Results are kept in a cache keyed by blob id, so unchanged blobs are never checked twice.
+
+    """
+    cache = cache if cache is not None else ResultCache(**options)
+
+    violations = []
+    # pathspecs are relative to cwd; listed paths and blob names are relative to the top level
+    paths = list_staged_paths(cwd, pathspecs)
+    for path, blob_id, source in iter_staged_blobs(paths, cwd=get_toplevel(cwd)):
+        violations.extend(cache.lint(path, source, digest=blob_id))
+    return violations
@@ -0,0 +1,196 @@
+"""
+Logger alias index tests.
+
+"""
+from ast import parse
+from textwrap import dedent
+
+from hamcrest import (
+    assert_that,
+    contains,
+    equal_to,
+    has_entries,
+    is_,
+)
+
+from logging_format.aliases import LoggerIndex, get_module_name, update_logger_index
+from logging_format.api import LoggingFormatValidator
+from logging_format.runner import iter_python_files, lint_path
+
+
+SERVICE = dedent("""\
+    from app.log import log, get_logger
+    from .metrics import stats
+    from app import log as log_module
+
+    logger = get_logger(__name__)
+
+
+    def handle(value):
+        log.info(f"Handling {value}")
+        stats.info(f"Handled {value}")
+        logger.info(f"Done {value}")
+        get_logger("app").info(f"Done {value}")
+        log_module.log.info(f"Done {value}")
+
+
+    def shadow(stats):
+        stats.info(f"Handled {stats}")
+""")
+
+
+def make_project(tmpdir):
+    package = tmpdir.mkdir("app")
+    package.join("__init__.py").write("")
+    package.join("log.py").write(dedent("""\
+        import logging
+
+        log = logging.getLogger("app")
+
+
+        def get_logger(name):
+            return logging.getLogger(name)
+    """))
+    package.join("metrics.py").write(dedent("""\
+        class Stats(object):
+            def info(self, message):
+                pass
+
+
+        stats = Stats()
+    """))
+    package.join("service.py").write(SERVICE)
+    return package
+
+
+def test_get_module_name(tmpdir):
+    package = make_project(tmpdir)
+
+    assert_that(get_module_name(str(package.join("service.py"))), is_(equal_to("app.service")))
+    assert_that(get_module_name(str(package.join("__init__.py"))), is_(equal_to("app")))
+
+
+def test_get_aliases(tmpdir):
+    """
+    Imports are followed across modules to loggers, logger factories and other objects.
+
+    """
+    package = make_project(tmpdir)
+    index = LoggerIndex()
+    index.update(iter_python_files([str(package)]))
+
+    assert_that(index.get_aliases(str(package.join("service.py"))), is_(equal_to(dict(
+        get_logger="factory",
+        handle="other",
+        log="logger",
+        logger="logger",
+        shadow="other",
+        stats="other",
+    ))))
+    assert_that(index.get_aliases(str(package.join("log.py"))), has_entries(logging="logger"))
+
+
+def test_update_logger_index(tmpdir):
+    """
+    The persisted index only re-reads modules whose content changed.
+
+    """
+    package = make_project(tmpdir)
+    path = str(tmpdir.join("loggers.json"))
+
+    _, updated = update_logger_index(path, iter_python_files([str(package)]))
+    assert_that(updated, is_(equal_to(4)))
+    _, updated = update_logger_index(path, iter_python_files([str(package)]))
+    assert_that(updated, is_(equal_to(0)))
+
+    package.join("metrics.py").write("import logging\n\nstats = logging.getLogger('stats')\n")
+    index, updated = update_logger_index(path, iter_python_files([str(package)]))
+    assert_that(updated, is_(equal_to(1)))
+    assert_that(index.get_aliases(str(package.join("service.py"))), has_entries(stats="logger"))
+
+
+def test_lint_with_logger_index(tmpdir):
+    """
+    Calls on objects known not to be loggers are not reported; unknown receivers still are.
+
+    """
+    package = make_project(tmpdir)
+    path = str(tmpdir.join("loggers.json"))
+    update_logger_index(path, iter_python_files([str(package)]))
+
+    violations = lint_path(str(package.join("service.py")), logger_index=path)
+
+    assert_that([violation["line"] for violation in violations], contains(9, 11, 12, 13, 17))
+
+
+def test_lint_logger_wrapper(tmpdir):
+    """
+    Receivers that cannot be proven not to be loggers, such as the result of a wrapper, are still checked.
+
+    """
+    package = tmpdir.mkdir("app")
+    package.join("__init__.py").write("")
+    package.join("log.py").write(dedent("""\
+        import logging
+
+        loggers = {}
+
+
+        def get_logger(name):
+            logger = logging.getLogger(name)
+            logger.propagate = False
+            return logger
+
+
+        def get_name():
+            return "app"
+    """))
+    package.join("service.py").write(dedent("""\
+        from app.log import get_logger, get_name, loggers
+
+        log = get_logger(__name__)
+        cached = loggers["app"]
+        name = get_name()
+
+
+        def handle(value):
+            log.info(f"Handling {value}")
+            cached.info(f"Handling {value}")
+            name.info(f"Handling {value}")
+    """))
+    path = str(tmpdir.join("loggers.json"))
+    index, _ = update_logger_index(path, iter_python_files([str(package)]))
+
+    assert_that(index.get_aliases(str(package.join("service.py"))), is_(equal_to(dict(
+        get_name="other",
+        handle="other",
+        loggers="other",
+        name="other",
+    ))))
+    violations = lint_path(str(package.join("service.py")), logger_index=path)
+    assert_that([violation["line"] for violation in violations], contains(9, 10))
+
+
+def test_stale_logger_index(tmpdir, monkeypatch):
+    """
+    Modules that changed since they were indexed are not trusted, so their names are classified by method.
+
+    """
+    metrics = tmpdir.join("metrics.py")
+    metrics.write("class Stats(object):\n    pass\n\n\nstats = Stats()\n")
+    service = tmpdir.join("service.py")
+    service.write('from metrics import stats\nstats.info(f"{1}")\n')
+    path = str(tmpdir.join("loggers.json"))
+    update_logger_index(path, iter_python_files([str(tmpdir)]))
+    source = service.read("rb")
+    assert_that(LoggerIndex.load(path).get_aliases(str(service), source), has_entries(stats="other"))
+    assert_that(LoggerIndex.load(path).get_aliases(str(service), source + b"\n"), is_(equal_to({})))
+
+    metrics.write("import logging\n\nstats = logging.getLogger()\n")
+    monkeypatch.setattr(LoggingFormatValidator, "logger_index", path)
+    lines = service.readlines()
+    violations = LoggingFormatValidator(parse("".join(lines)), str(service), lines).run()
+    assert_that([violation[:2] for violation in violations], contains((2, 11)))
+
+    metrics.remove()
+    assert_that(LoggerIndex.load(path).get_aliases(str(service)), is_(equal_to({})))
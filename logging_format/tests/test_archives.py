@@ -0,0 +1,79 @@
+"""
+Archive tests.
+
+"""
+from io import BytesIO
+from tarfile import TarInfo, open as open_tarfile
+from zipfile import ZipFile
+
+from hamcrest import (
+    assert_that,
+    contains,
+    equal_to,
+    has_entries,
+    is_,
+)
+
+from logging_format.archives import is_archive, iter_archive_sources, iter_inputs
+from logging_format.runner import check_input
+
+
+SOURCE = b'logger.warn("Hello World")\n'
+
+
+def make_tarfile(path):
+    with open_tarfile(path, "w:gz") as archive:
+        for name, data in [("package/example.py", SOURCE), ("package/README.md", b"")]:
+            info = TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, BytesIO(data))
+
+
+def make_wheel(path):
+    with ZipFile(path, "w") as archive:
+        archive.writestr("package/", "")
+        archive.writestr("package/example.py", SOURCE)
+        archive.writestr("package-1.0.dist-info/METADATA", "")
+
+
+def test_is_archive():
+    assert_that(
+        [is_archive(path) for path in ("a.whl", "a.zip", "a.tar.gz", "a.tgz", "a.py", "a.gz")],
+        is_(equal_to([True, True, True, True, False, False])),
+    )
+
+
+def test_tarfile_sources(tmpdir):
+    path = str(tmpdir.join("package-1.0.tar.gz"))
+    make_tarfile(path)
+
+    assert_that(list(iter_archive_sources(path)), contains(
+        ("{}!package/example.py".format(path), SOURCE),
+    ))
+
+
+def test_wheel_sources(tmpdir):
+    path = str(tmpdir.join("package-1.0-py3-none-any.whl"))
+    make_wheel(path)
+
+    assert_that(list(iter_archive_sources(path)), contains(
+        ("{}!package/example.py".format(path), SOURCE),
+    ))
+
+
+def test_check_archive_inputs(tmpdir):
+    """
+    Archive members are checked in place alongside plain files.
+
+    """
+    path = str(tmpdir.join("package-1.0-py3-none-any.whl"))
+    make_wheel(path)
+    plain = tmpdir.join("example.py")
+    plain.write_binary(SOURCE)
+
+    results = [check_input(item) for item in iter_inputs([path, str(plain)])]
+
+    assert_that(results, contains(
+        has_entries(violations=contains(has_entries(path="{}!package/example.py".format(path), code="G010"))),
+        has_entries(violations=contains(has_entries(path=str(plain), code="G010"))),
+    ))
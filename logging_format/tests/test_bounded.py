@@ -0,0 +1,246 @@
+"""
+Bounded-memory and guard tests.
+
+"""
+from ast import AST, parse
+from textwrap import dedent
+
+from hamcrest import (
+    assert_that,
+    contains,
+    equal_to,
+    greater_than,
+    has_entries,
+    has_length,
+    is_,
+    starts_with,
+)
+
+from logging_format.api import LoggingFormatValidator
+from logging_format.bounded import iter_statement_chunks
+from logging_format.guards import FileLimits, GuardedLoggingVisitor, scan_lines
+from logging_format.runner import check_path, lint_source
+from logging_format.visitor import LoggingVisitor
+
+
+SOURCE = dedent("""\
+    # -*- coding: utf-8 -*-
+    import logging
+
+    @decorate
+    @decorate(
+        "twice",
+    )
+    def greet(world):
+        logging.info(f"Hello {world}")
+
+    try:
+        pass
+    except Exception as error:
+        logging.error("Failed %s" % error)
+    else:
+        logging.warn("Hello World")
+    finally:
+        pass
+    x = 1; logging.info("Hello " + str(x))
+""").encode("utf-8")
+
+
+def test_statement_chunks():
+    """
+    Decorators and clauses stay with their statement.
+
+    """
+    chunks = list(iter_statement_chunks(SOURCE))
+
+    assert_that([start for start, _ in chunks], contains(2, 4, 11, 19))
+    assert_that(chunks[2][1], starts_with("try:"))
+
+
+def test_bounded_check(tmpdir):
+    """
+    Bounded mode reports the same violations as a full walk.
+
+    """
+    example = tmpdir.join("example.py")
+    example.write_binary(SOURCE)
+
+    result = check_path(str(example), bounded=True, memory=True)
+
+    assert_that(result["violations"], has_length(4))
+    assert_that(result["violations"], is_(equal_to(lint_source(SOURCE, str(example)))))
+    assert_that(result["peak_memory"], is_(greater_than(0)))
+
+
+def test_bounded_constant_templates(tmpdir):
+    """
+    Bounded mode resolves module constants defined after their use, like a full walk.
+
+    """
+    example = tmpdir.join("example.py")
+    example.write(dedent("""\
+        def greet():
+            logging.info(GREETING)
+            logging.info(greeting)
+
+        GREETING = "Hello World"
+    """))
+
+    result = check_path(str(example), bounded=True, constant_templates=True)
+
+    assert_that([violation["line"] for violation in result["violations"]], contains(3))
+    violations = lint_source(example.read_binary(), str(example), constant_templates=True)
+    assert_that(result["violations"], is_(equal_to(violations)))
+
+
+def test_module_state_holds_no_nodes():
+    """
+    The checks that need the whole module do not keep any statement's tree alive until it is finished.
+
+    """
+    tree = parse(dedent("""\
+        import asyncio
+        import logging
+
+        handler = logging.StreamHandler()
+        logging.getLogger().addHandler(handler)
+        logging.getLogger().addHandler(logging.FileHandler("app.log"))
+        logging.basicConfig(format="%(message)s")
+
+
+        async def main():
+            logging.info("Hello World")
+    """))
+    visitor = LoggingVisitor(logging_flags=True)
+    for statement in tree.body:
+        visitor.visit(statement)
+
+    def iter_values(value):
+        if isinstance(value, dict):
+            value = list(value.items())
+        if isinstance(value, (list, set, tuple)):
+            for item in value:
+                for child in iter_values(item):
+                    yield child
+        else:
+            yield value
+
+    state = [
+        visitor.blocking_handlers,
+        visitor.bound_handlers,
+        visitor.attached_handlers,
+        visitor.async_logging_calls,
+        visitor.logging_config_calls,
+    ]
+    assert_that(all(state), is_(equal_to(True)))
+    assert_that([value for value in iter_values(state) if isinstance(value, AST)], is_(equal_to([])))
+
+    visitor.finish_module()
+    assert_that([reason.split(" ", 1)[0] for _, reason in visitor.violations], contains(
+        "G301", "G301", "G302", "G405",
+    ))
+
+
+def test_size_guard(tmpdir):
+    """
+    Files over the size limit are skipped rather than failing the run.
+
+    """
+    example = tmpdir.join("example.py")
+    example.write_binary(SOURCE)
+
+    result = check_path(str(example), limits=FileLimits(max_bytes=100))
+
+    assert_that(result, has_entries(
+        violations=[],
+        skipped="source is {} bytes, limit is 100".format(len(SOURCE)),
+    ))
+
+
+def test_time_guard(tmpdir):
+    """
+    Files that take too long to walk are skipped rather than failing the run.
+
+    """
+    example = tmpdir.join("example.py")
+    example.write_binary(SOURCE)
+
+    result = check_path(str(example), bounded=True, limits=FileLimits(max_seconds=0))
+
+    assert_that(result, has_entries(skipped="walk exceeded 0 seconds"))
+
+
+def test_node_guard(tmpdir):
+    """
+    Files with too many nodes to walk are skipped rather than failing the run.
+
+    """
+    example = tmpdir.join("example.py")
+    example.write("".join("value = [{0}, {0}, {0}]\n".format(index) for index in range(500)))
+
+    result = check_path(str(example), limits=FileLimits(max_nodes=1000))
+
+    assert_that(result, has_entries(skipped="walk exceeded 1000 nodes"))
+
+
+def test_node_guard_counts_logging_arguments():
+    """
+    Every node is counted, including the arguments of logging calls.
+
+    """
+    counts = []
+    for source in (
+        'logging.info("Hello %s", [[1, 2], [3, 4]], extra=dict(a=1, b=(2, 3)))\n',
+        'logging.sleep("Hello %s", [[1, 2], [3, 4]], extra=dict(a=1, b=(2, 3)))\n',
+    ):
+        visitor = GuardedLoggingVisitor(FileLimits(max_nodes=1000))
+        visitor.visit(parse(source))
+        counts.append(visitor.nodes)
+
+    assert_that(counts[0], is_(equal_to(counts[1])))
+
+
+def test_scan_lines():
+    lines = [
+        'logger.info(f"Hello {world}")\n',
+        'logger.warning("Hello {}".format(world))\n',
+        'logger.info("Hello %s", world)\n',
+        'response.info(of"ignored")\n',
+        'logger.info(f"Hello World", extra={"braces": f"{{}}"})\n',
+        'logger.info("Done %s", f"{world}")\n',
+        'logger.info("Done", extra={"world": "{}".format(world)})\n',
+        'logger.info("Done %s", "{}".format(world))\n',
+        'logger.info( "Hello {}" .format(world))\n',
+    ]
+
+    assert_that(list(scan_lines(lines)), contains(
+        (1, 12, "G004 Logging statement uses f-string"),
+        (2, 15, "G001 Logging statement uses string.format()"),
+        (9, 13, "G001 Logging statement uses string.format()"),
+    ))
+
+
+def test_validator_degraded_mode(monkeypatch):
+    """
+    The flake8 plugin reports files over its limits once, then scans them textually unless told to skip them.
+
+    """
+    lines = ["import logging\n"] + ['logging.info(f"Hello {world}")\n'] * 3
+    tree = parse("".join(lines))
+    monkeypatch.setattr(LoggingFormatValidator, "max_file_bytes", 50)
+
+    violations = [violation[:3] for violation in LoggingFormatValidator(tree, "example.py", lines).run()]
+
+    assert_that(violations, contains(
+        (1, 0, "G900 Logging checks ran in degraded mode (scan): source is 108 bytes, limit is 50"),
+        (2, 13, "G004 Logging statement uses f-string"),
+        (3, 13, "G004 Logging statement uses f-string"),
+        (4, 13, "G004 Logging statement uses f-string"),
+    ))
+
+    monkeypatch.setattr(LoggingFormatValidator, "degraded_mode", "skip")
+    violations = [violation[:3] for violation in LoggingFormatValidator(tree, "example.py", lines).run()]
+
+    assert_that(violations, contains(
+        (1, 0, "G900 Logging checks ran in degraded mode (skip): source is 108 bytes, limit is 50"),
+    ))
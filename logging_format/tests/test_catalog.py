@@ -0,0 +1,66 @@
+"""
+Message template catalog tests.
+
+"""
+from io import StringIO
+from json import loads
+
+from hamcrest import (
+    assert_that,
+    contains,
+    equal_to,
+    has_entries,
+    is_,
+)
+
+from logging_format.catalog import count_placeholders, template_id, write_catalog
+
+
+def test_count_placeholders():
+    assert_that(count_placeholders("Hello %s, %(name)r: %.2f%%"), is_(equal_to(3)))
+    assert_that(count_placeholders("Hello {world} from {}"), is_(equal_to(2)))
+    assert_that(count_placeholders("Hello World {"), is_(equal_to(0)))
+
+
+def test_write_catalog(tmpdir):
+    """
+    Constant templates, including module constants not shadowed by local names, are catalogued with stable IDs;
+    templates used in several modules are duplicates.
+
+    """
+    tmpdir.join("first.py").write(
+        'logger.info("Hello %s", world)\n'
+        'logger.info(f"Hello {world}")\n'
+    )
+    tmpdir.join("second.py").write(
+        'logger.warning("Hello %s", world, extra=dict(planet="Earth"))\n'
+        'logger.debug(f"Goodbye World")\n'
+        'logger.info(WELCOME)\n'
+        'WELCOME = "Welcome %s"\n'
+        'def shadow(WELCOME, greetings):\n'
+        '    logger.info(WELCOME)\n'
+        '    for WELCOME in greetings:\n'
+        '        logger.info(WELCOME)\n'
+    )
+    outfile = StringIO()
+
+    duplicates = write_catalog([str(tmpdir)], outfile)
+
+    records = [loads(line) for line in outfile.getvalue().splitlines()]
+    assert_that(records, contains(
+        has_entries(
+            id=template_id("Hello %s"),
+            template="Hello %s",
+            level="info",
+            path=str(tmpdir.join("first.py")),
+            line=1,
+            placeholders=1,
+            extra_keys=[],
+        ),
+        has_entries(id=template_id("Hello %s"), level="warning", extra_keys=["planet"]),
+        has_entries(template="Goodbye World", placeholders=0),
+        has_entries(template="Welcome %s", line=3, placeholders=1),
+    ))
+    assert_that(duplicates, contains(
+        (template_id("Hello %s"), "Hello %s", [str(tmpdir.join("first.py")), str(tmpdir.join("second.py"))]),
+    ))
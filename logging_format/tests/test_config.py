@@ -0,0 +1,268 @@
+"""
+Logging configuration tests.
+
+"""
+from ast import parse
+from json import dumps
+from textwrap import dedent
+
+from hamcrest import (
+    assert_that,
+    calling,
+    contains,
+    equal_to,
+    is_,
+    raises,
+)
+
+from logging_format.config import (
+    ConfigError,
+    check_config_path,
+    check_dict_config,
+    evaluate_literal,
+    get_format_fields,
+    parse_field_severities,
+)
+from logging_format.violations import (
+    CONFIG_DEBUG_LEVEL_VIOLATION,
+    CONFIG_FRAME_FIELD_VIOLATION,
+    CONFIG_NETWORK_HANDLER_VIOLATION,
+    FORMATTER_HIGH_COST_VIOLATION,
+    FORMATTER_LOW_COST_VIOLATION,
+    LOGGING_FLAGS_VIOLATION,
+)
+from logging_format.visitor import LoggingVisitor
+
+
+CONFIG = dict(
+    version=1,
+    formatters=dict(
+        verbose=dict(format="%(asctime)s %(pathname)s:%(lineno)d %(message)s"),
+        brace=dict(format="{asctime} {funcName} {message}", style="{"),
+        plain=dict(format="%(asctime)s %(message)s"),
+    ),
+    handlers=dict(
+        mail={"class": "logging.handlers.SMTPHandler", "mailhost": "localhost"},
+        queued={"class": "logging.handlers.QueueHandler", "handlers": ["http"]},
+        http={"class": "logging.handlers.HTTPHandler", "host": "localhost", "url": "/"},
+    ),
+    loggers=dict(
+        urllib3=dict(level="DEBUG"),
+        service=dict(level="INFO"),
+    ),
+    root=dict(level=10, handlers=["mail"]),
+)
+
+
+def test_get_format_fields():
+    assert_that(get_format_fields("%(name)s %(lineno)d"), contains("name", "lineno"))
+    assert_that(get_format_fields("{name} {lineno:>4}", "{"), contains("name", "lineno"))
+    assert_that(get_format_fields("$name ${lineno}", "$"), contains("name", "lineno"))
+
+
+def test_check_dict_config():
+    """
+    Network handlers not behind a queue, DEBUG loggers and frame fields are reported.
+
+    """
+    assert_that(list(check_dict_config(CONFIG)), contains(
+        ("mail", CONFIG_NETWORK_HANDLER_VIOLATION.format("mail (SMTPHandler)")),
+        ("root", CONFIG_DEBUG_LEVEL_VIOLATION.format("root")),
+        ("urllib3", CONFIG_DEBUG_LEVEL_VIOLATION.format("urllib3")),
+        ("brace", CONFIG_FRAME_FIELD_VIOLATION.format("brace (funcName)")),
+        ("verbose", CONFIG_FRAME_FIELD_VIOLATION.format("verbose (lineno, pathname)")),
+    ))
+
+
+def test_check_json_config(tmpdir):
+    path = tmpdir.join("logging.json")
+    path.write(dumps(CONFIG, indent=4))
+
+    lines = path.read().splitlines()
+    assert_that([
+        (lines[line - 1].strip(), reason.split(" ", 1)[0])
+        for line, reason in check_config_path(str(path))
+    ], contains(
+        ('"mail": {', "G400"),
+        ('"root": {', "G401"),
+        ('"urllib3": {', "G401"),
+        ('"brace": {', "G402"),
+        ('"verbose": {', "G402"),
+    ))
+
+
+def test_check_ini_config(tmpdir):
+    path = tmpdir.join("logging.ini")
+    path.write(dedent("""\
+        [loggers]
+        keys=root
+
+        [handlers]
+        keys=syslog
+
+        [formatters]
+        keys=default
+
+        [logger_root]
+        level=DEBUG
+        handlers=syslog
+
+        [handler_syslog]
+        class=handlers.SysLogHandler
+        formatter=default
+
+        [formatter_default]
+        format=%(asctime)s %(module)s %(message)s
+    """))
+
+    assert_that(list(check_config_path(str(path))), contains(
+        (14, CONFIG_NETWORK_HANDLER_VIOLATION.format("syslog (SysLogHandler)")),
+        (10, CONFIG_DEBUG_LEVEL_VIOLATION.format("root")),
+        (18, CONFIG_FRAME_FIELD_VIOLATION.format("default (module)")),
+    ))
+
+
+def test_check_invalid_config(tmpdir):
+    path = tmpdir.join("logging.json")
+    path.write("{")
+
+    assert_that(calling(list).with_args(check_config_path(str(path))), raises(ConfigError))
+
+
+def test_dict_config_literal():
+    """
+    The literal parts of a dictConfig call are checked, reported at the offending entry.
+
+    """
+    tree = parse(dedent("""\
+        import logging.config
+
+        logging.config.dictConfig({
+            "version": 1,
+            "handlers": {
+                "console": {"class": "logging.StreamHandler", "stream": sys.stdout},
+            },
+            "loggers": {
+                "botocore": {"level": "DEBUG"},
+            },
+        })
+    """))
+    visitor = LoggingVisitor()
+    visitor.visit(tree)
+
+    assert_that(
+        [(node.lineno, reason) for node, reason in visitor.violations],
+        is_(equal_to([(9, CONFIG_DEBUG_LEVEL_VIOLATION.format("botocore"))])),
+    )
+
+
+def test_config_formatter_fields():
+    """
+    Flags whose fields a dictConfig formatter uses are not required; formatters that cannot be seen require none.
+
+    """
+    tree = parse(dedent("""\
+        import logging.config
+
+        logging.config.dictConfig({
+            "version": 1,
+            "formatters": {"threads": {"format": "%(threadName)s %(process)d %(message)s"}},
+        })
+    """))
+    visitor = LoggingVisitor(logging_flags=True)
+    visitor.visit(tree)
+
+    assert_that(
+        [(node.lineno, reason) for node, reason in visitor.violations],
+        is_(equal_to([(3, LOGGING_FLAGS_VIOLATION.format("logMultiprocessing"))])),
+    )
+
+    tree = parse(dedent("""\
+        import logging.config
+
+        logging.config.fileConfig("logging.ini")
+        logging.basicConfig(format="%(message)s")
+    """))
+    visitor = LoggingVisitor(logging_flags=True)
+    visitor.visit(tree)
+
+    assert_that(visitor.violations, is_(equal_to([])))
+
+
+def test_dict_config_literal_shapes():
+    """
+    Tuple keys, unhashable keys and handler entries that are not names do not stop the checks.
+
+    """
+    tree = parse(dedent("""\
+        import logging.config
+
+        logging.config.dictConfig({
+            ("a", "b"): 1,
+            "version": 1,
+            "handlers": {
+                "queued": {"class": "logging.handlers.QueueHandler", "handlers": [{"class": "x"}, "mail"]},
+                "mail": {"class": "logging.handlers.SMTPHandler"},
+                "http": {"class": "logging.handlers.HTTPHandler"},
+            },
+        })
+    """))
+    visitor = LoggingVisitor(logging_flags=True)
+    visitor.visit(tree)
+
+    assert_that(
+        [(node.lineno, reason) for node, reason in visitor.violations],
+        contains(
+            (9, CONFIG_NETWORK_HANDLER_VIOLATION.format("http (HTTPHandler)")),
+            (3, LOGGING_FLAGS_VIOLATION.format("logMultiprocessing, logProcesses, logThreads")),
+        ),
+    )
+    assert_that(evaluate_literal(parse('{("a", "b"): 1, ["c"]: 2}', mode="eval").body), is_(equal_to({
+        ("a", "b"): 1,
+    })))
+
+
+def test_parse_field_severities():
+    severities = parse_field_severities("asctime:low, lineno:off")
+
+    assert_that(severities["asctime"], is_(equal_to("low")))
+    assert_that(severities["lineno"], is_(equal_to("off")))
+    assert_that(severities["funcName"], is_(equal_to("high")))
+    assert_that(calling(parse_field_severities).with_args("lineno"), raises(ValueError))
+
+
+def test_formatter_fields():
+    """
+    Costly fields in Formatter and basicConfig templates are reported by severity.
+
+    """
+    tree = parse(dedent("""\
+        import logging
+
+        logging.basicConfig(format="%(asctime)s %(threadName)s %(message)s")
+        formatter = logging.Formatter("{funcName}:{lineno} {message}", style="{")
+        plain = logging.Formatter(fmt="%(asctime)s %(message)s")
+    """))
+    visitor = LoggingVisitor()
+    visitor.visit(tree)
+
+    assert_that(
+        [(node.lineno, reason) for node, reason in visitor.violations],
+        contains(
+            (3, FORMATTER_LOW_COST_VIOLATION.format("threadName")),
+            (4, FORMATTER_HIGH_COST_VIOLATION.format("funcName, lineno")),
+        ),
+    )
+
+    visitor = LoggingVisitor(field_severities=parse_field_severities("threadName:off,asctime:high"), logging_flags=True)
+    visitor.visit(tree)
+
+    assert_that(
+        [(node.lineno, reason) for node, reason in visitor.violations],
+        contains(
+            (3, FORMATTER_HIGH_COST_VIOLATION.format("asctime")),
+            (4, FORMATTER_HIGH_COST_VIOLATION.format("funcName, lineno")),
+            (5, FORMATTER_HIGH_COST_VIOLATION.format("asctime")),
+            (3, LOGGING_FLAGS_VIOLATION.format("logMultiprocessing, logProcesses")),
+        ),
+    )
@@ -0,0 +1,71 @@
+"""
+Engine equivalence tests.
+
+"""
+from ast import parse
+from io import StringIO
+from os.path import dirname
+
+from hamcrest import (
+    assert_that,
+    contains_string,
+    empty,
+    equal_to,
+    is_,
+)
+
+from logging_format.equivalence import (
+    bounded_engine,
+    check_equivalence,
+    find_mismatches,
+    generate_sources,
+    iter_corpus,
+)
+
+
+def test_generated_sources_are_valid():
+    """
+    Generated sources are deterministic, valid python.
+
+    """
+    sources = list(generate_sources(20, seed=1))
+
+    assert_that(sources, is_(equal_to(list(generate_sources(20, seed=1)))))
+    for path, source in sources:
+        parse(source, path)
+
+
+def test_generated_sources_equivalence():
+    """
+    All engines agree with the reference visitor on generated sources.
+
+    """
+    assert_that(find_mismatches(generate_sources(200)), is_(empty()))
+
+
+def test_corpus_equivalence():
+    """
+    All engines agree with the reference visitor on this package.
+
+    """
+    assert_that(find_mismatches(iter_corpus([dirname(dirname(__file__))])), is_(empty()))
+
+
+def test_mismatch_reported():
+    """
+    Disagreeing engines are reported.
+
+    """
+    items = [("example.py", b'logger.warn("Hello World")\n')]
+
+    mismatches = find_mismatches(items, dict(broken=lambda items: {}, bounded=bounded_engine))
+
+    assert_that(mismatches, is_(equal_to([("example.py", "broken", [(1, 0, "G010")], None)])))
+
+
+def test_check_equivalence():
+    outfile = StringIO()
+
+    check_equivalence([], outfile, samples=5)
+
+    assert_that(outfile.getvalue(), contains_string("5 sources checked with 3 engines, 0 mismatches"))
@@ -0,0 +1,79 @@
+"""
+Extra key report tests.
+
+"""
+from hamcrest import (
+    assert_that,
+    contains,
+    contains_string,
+    equal_to,
+    has_entries,
+    is_,
+)
+
+from logging_format.extras import (
+    ExtraKeyReport,
+    build_report,
+    format_whitelist_provider,
+    get_service,
+    normalize_key,
+)
+
+
+def test_normalize_key():
+    assert_that(
+        {normalize_key(key) for key in ("user_id", "userId", "user-id", "UserID")},
+        is_(equal_to({"userid"})),
+    )
+
+
+def test_get_service(tmpdir, monkeypatch):
+    assert_that(get_service("src/billing/models/invoice.py", ["src"]), is_(equal_to("billing")))
+    assert_that(get_service("src/setup.py", ["src/"]), is_(equal_to("src")))
+    assert_that(get_service("other/setup.py", ["src"]), is_(equal_to("setup.py")))
+    monkeypatch.chdir(str(tmpdir.mkdir("services")))
+    assert_that(get_service("./svc_a/a.py", ["."]), is_(equal_to("svc_a")))
+    assert_that(get_service("svc_b/b.py", ["."]), is_(equal_to("svc_b")))
+    assert_that(get_service("setup.py", ["."]), is_(equal_to("services")))
+
+
+def test_build_report(tmpdir):
+    """
+    Keys are counted per service and level, and clashes and near-duplicates are flagged.
+
+    """
+    tmpdir.mkdir("billing").join("invoice.py").write(
+        'logger.info("Billed", extra=dict(user_id=user.id, amount=amount))\n'
+        'logger.debug("Billed", extra={"userId": user.id, "name": name})\n'
+    )
+    tmpdir.mkdir("users").join("user.py").write(
+        'logger.info("Created", extra=dict(user_id=user.id, debug_email=user.email))\n'
+    )
+
+    report = build_report([str(tmpdir)])
+
+    assert_that(report.to_dict()["keys"][0], has_entries(
+        key="user_id",
+        count=2,
+        services={"billing": 1, "users": 1},
+        levels={"info": 2},
+    ))
+    assert_that(report.clashes(), contains("name"))
+    assert_that(report.near_duplicates(), contains(["user_id", "userId"]))
+    assert_that(report.proposed_whitelist(), contains("amount", "user_id"))
+    assert_that(format_whitelist_provider(report), contains_string("        'user_id',\n"))
+
+
+def test_whitelist_provider_quoting():
+    """
+    Keys that need escaping still render a valid provider module.
+
+    """
+    report = ExtraKeyReport()
+    for key in ('say "hi"', "back\\slash", "it's"):
+        report.add(key, "service", "info")
+
+    namespace = {}
+    exec(format_whitelist_provider(report), namespace)
+
+    assert_that(namespace["whitelist"](), is_(equal_to(report.proposed_whitelist())))
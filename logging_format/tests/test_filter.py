@@ -0,0 +1,81 @@
+"""
+Whitelist filter tests.
+
+"""
+from logging import DEBUG, INFO, LogRecord
+
+from hamcrest import (
+    assert_that,
+    empty,
+    equal_to,
+    is_,
+)
+
+from logging_format.filter import WhitelistFilter
+
+
+def make_record(level=INFO, **extra):
+    record = LogRecord("test", level, __file__, 1, "Hello {world}", (), None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_whitelisted_extra():
+    """
+    Whitelisted extra fields pass without violations.
+
+    """
+    log_filter = WhitelistFilter(whitelist=["world"])
+
+    assert_that(log_filter.filter(make_record(world="Earth")), is_(equal_to(True)))
+    assert_that(log_filter.checked, is_(equal_to(1)))
+    assert_that(log_filter.violations, is_(empty()))
+
+
+def test_non_whitelisted_extra():
+    """
+    Dynamically built extra fields are counted per key.
+
+    """
+    log_filter = WhitelistFilter(whitelist=["world"])
+
+    log_filter.filter(make_record(hello="Earth"))
+    log_filter.filter(make_record(hello="Mars", debug_planet="Mars"))
+
+    assert_that(log_filter.violations, is_(equal_to({"hello": 2})))
+
+
+def test_debug_ok_with_non_whitelisted_extra():
+    """
+    Debug records are not checked against the whitelist.
+
+    """
+    log_filter = WhitelistFilter(whitelist=[])
+
+    log_filter.filter(make_record(level=DEBUG, hello="Earth"))
+
+    assert_that(log_filter.violations, is_(empty()))
+
+
+def test_drop():
+    """
+    Records with violations are rejected when dropping is enabled.
+
+    """
+    log_filter = WhitelistFilter(whitelist=[], drop=True)
+
+    assert_that(log_filter.filter(make_record(hello="Earth")), is_(equal_to(False)))
+    assert_that(log_filter.filter(make_record()), is_(equal_to(True)))
+
+
+def test_sampling():
+    """
+    A zero sample rate skips every record.
+
+    """
+    log_filter = WhitelistFilter(whitelist=[], sample_rate=0.0)
+
+    log_filter.filter(make_record(hello="Earth"))
+
+    assert_that(log_filter.checked, is_(equal_to(0)))
+    assert_that(log_filter.violations, is_(empty()))
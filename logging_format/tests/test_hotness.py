@@ -0,0 +1,160 @@
+"""
+Profile-guided prioritization tests.
+
+"""
+from ast import parse, walk
+from cProfile import Profile
+from runpy import run_path
+from sqlite3 import connect
+from zipfile import ZipFile
+
+from hamcrest import (
+    assert_that,
+    contains,
+    equal_to,
+    has_entries,
+    is_,
+)
+
+from logging_format.archives import iter_archive_sources
+from logging_format.hotness import (
+    HotnessIndex,
+    annotate_violations,
+    get_function_ranges,
+    numbits_to_lines,
+    prioritize,
+)
+from logging_format.runner import format_violation, lint_path, lint_source
+
+
+SOURCE = """\
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def hot(value):
+    logger.info("hot {}".format(value))
+
+
+def cold(value):
+    logger.info("cold {}".format(value))
+
+
+def warm(value):
+    logger.info("warm %s" % value)
+
+
+for value in range(10):
+    hot(value)
+warm(0)
+"""
+
+
+def make_module(tmpdir):
+    path = tmpdir.join("example.py")
+    path.write(SOURCE)
+    return str(path)
+
+
+def test_numbits_to_lines():
+    assert_that(numbits_to_lines(b"\x06\x01"), is_(equal_to({1, 2, 8})))
+
+
+def test_prioritize_by_profile(tmpdir):
+    """
+    Violations in the most called functions come first; unprofiled code comes last.
+
+    """
+    path = make_module(tmpdir)
+    profile = Profile()
+    profile.runcall(run_path, path)
+    profile.dump_stats(str(tmpdir.join("example.prof")))
+
+    index = HotnessIndex()
+    index.add_profile(str(tmpdir.join("example.prof")))
+    violations = prioritize(annotate_violations(lint_path(path), index))
+
+    assert_that(violations, contains(
+        has_entries(function="hot", calls=10, line=7),
+        has_entries(function="warm", calls=1, line=15),
+        has_entries(function="cold", calls=0, line=11),
+    ))
+    assert_that(format_violation(violations[0]), is_(equal_to(
+        "{}:7:17: G001 Logging statement uses string.format() [calls=10 in hot]".format(path),
+    )))
+
+    violations = prioritize(violations, min_calls=2)
+    assert_that(violations, contains(has_entries(function="hot")))
+
+
+def test_prioritize_by_coverage(tmpdir):
+    """
+    Coverage data distinguishes functions that ran from those that did not.
+
+    """
+    path = make_module(tmpdir)
+    database = connect(str(tmpdir.join(".coverage")))
+    database.executescript("""
+        create table file (id integer primary key, path text);
+        create table line_bits (file_id integer, context_id integer, numbits blob);
+    """)
+    database.execute("insert into file values (1, ?)", (path,))
+    # lines 7 and 15 ran
+    database.execute("insert into line_bits values (1, 1, ?)", (b"\x80\x80",))
+    database.commit()
+    database.close()
+
+    index = HotnessIndex()
+    index.add_coverage(str(tmpdir.join(".coverage")))
+    violations = prioritize(annotate_violations(lint_path(path), index))
+
+    assert_that(violations, contains(
+        has_entries(function="hot", calls=1),
+        has_entries(function="warm", calls=1),
+        has_entries(function="cold", calls=0),
+    ))
+
+
+def test_get_function_ranges_without_end_lines():
+    """
+    Functions span to their last statement on interpreters that do not record end lines.
+
+    """
+    tree = parse(SOURCE)
+    for node in walk(tree):
+        node.__dict__.pop("end_lineno", None)
+
+    assert_that(get_function_ranges(tree), contains(
+        ("hot", 6, {6}, 7, 7),
+        ("cold", 10, {10}, 11, 11),
+        ("warm", 14, {14}, 15, 15),
+    ))
+
+
+def test_annotate_paths_with_separator(tmpdir):
+    """
+    Files and archive members whose names contain `!` are still annotated.
+
+    """
+    path = tmpdir.mkdir("odd!dir").join("example.py")
+    path.write(SOURCE)
+    archive = str(tmpdir.join("package.whl"))
+    with ZipFile(archive, "w") as outfile:
+        outfile.writestr("package/odd!name.py", SOURCE)
+    violations = lint_path(str(path)) + [
+        violation
+        for member, source in iter_archive_sources(archive)
+        for violation in lint_source(source, member)
+    ]
+
+    violations = annotate_violations(violations, HotnessIndex())
+
+    assert_that(
+        [(violation["path"], violation["function"]) for violation in violations],
+        contains(*[
+            (violation_path, function)
+            for violation_path in (str(path), "{}!package/odd!name.py".format(archive))
+            for function in ("hot", "cold", "warm")
+        ]),
+    )
@@ -0,0 +1,94 @@
+"""
+Inventory tests.
+
+"""
+from io import StringIO
+from json import loads
+from textwrap import dedent
+
+from hamcrest import (
+    assert_that,
+    contains,
+    equal_to,
+    has_entries,
+    has_length,
+    is_,
+)
+
+from logging_format.inventory import inventory_source, write_inventory
+
+
+def test_inventory():
+    """
+    Every logging call site is recorded with its context.
+
+    """
+    source = dedent("""\
+        import logging
+
+        logger = logging.getLogger(__name__)
+
+        def process(items):
+            for item in items:
+                logger.debug("Processing %s", item, extra=dict(item_id=item))
+            try:
+                pass
+            except Exception:
+                self.log.error(f"Failed {items}")
+    """)
+    entries = inventory_source(source, "example.py")
+
+    assert_that(entries, contains(
+        has_entries(
+            path="example.py",
+            line=7,
+            level="debug",
+            logger="logger",
+            template_kind="constant",
+            template="Processing %s",
+            extra_keys=["item_id"],
+            in_loop=True,
+            in_except=False,
+        ),
+        has_entries(
+            line=11,
+            level="error",
+            logger="self.log",
+            template_kind="f-string",
+            template=None,
+            extra_keys=[],
+            in_loop=False,
+            in_except=True,
+        ),
+    ))
+
+
+def test_inventory_function_in_loop():
+    """
+    A function defined inside a loop does not run in that loop. Only string extra keys are listed.
+
+    """
+    source = dedent("""\
+        for name in names:
+            def callback():
+                logger.info("Called", extra={"name": name, 1: name, **context})
+    """)
+    entries = inventory_source(source, "example.py")
+
+    assert_that(entries, has_length(1))
+    assert_that(entries[0]["in_loop"], is_(equal_to(False)))
+    assert_that(entries[0]["extra_keys"], is_(equal_to(["name"])))
+
+
+def test_write_inventory(tmpdir):
+    """
+    The inventory is written as JSON lines.
+
+    """
+    tmpdir.join("example.py").write('logger.warning("Hello World")\n')
+    outfile = StringIO()
+
+    count = write_inventory([str(tmpdir)], outfile)
+
+    assert_that(count, is_(equal_to(1)))
+    assert_that(loads(outfile.getvalue()), has_entries(level="warning", template="Hello World"))
@@ -0,0 +1,72 @@
+"""
+Sharding tests.
+
+"""
+from argparse import ArgumentTypeError
+
+from hamcrest import (
+    assert_that,
+    calling,
+    contains,
+    equal_to,
+    has_entries,
+    is_,
+    raises,
+)
+
+from logging_format.shard import (
+    assign_shards,
+    estimate_costs,
+    merge_results,
+    parse_shard,
+)
+
+
+def test_parse_shard():
+    assert_that(parse_shard("2/3"), is_(equal_to((2, 3))))
+    assert_that(calling(parse_shard).with_args("0/3"), raises(ArgumentTypeError))
+    assert_that(calling(parse_shard).with_args("two"), raises(ArgumentTypeError))
+
+
+def test_assign_shards():
+    """
+    The most expensive files are spread across shards first, balancing the total cost.
+
+    """
+    costs = {"a.py": 7, "b.py": 5, "c.py": 4, "d.py": 3, "e.py": 3, "f.py": 2}
+
+    assert_that(assign_shards(costs, 2), is_(equal_to([
+        ["a.py", "d.py", "f.py"],
+        ["b.py", "c.py", "e.py"],
+    ])))
+
+
+def test_estimate_costs(tmpdir):
+    """
+    Untimed files are estimated from their size at the throughput of the timed files.
+
+    """
+    timed = tmpdir.join("timed.py")
+    timed.write("x" * 100)
+    untimed = tmpdir.join("untimed.py")
+    untimed.write("x" * 300)
+
+    costs = estimate_costs([str(timed), str(untimed)], timings={str(timed): 2.0})
+
+    assert_that(costs, has_entries({str(timed): 2.0, str(untimed): 6.0}))
+
+
+def test_merge_results():
+    violations = [
+        dict(path="b.py", line=1, col=0, code="G004", message="G004 Logging statement uses f-string"),
+        dict(path="a.py", line=3, col=0, code="G010", message="G010 Logging statement uses 'warn'"),
+    ]
+
+    result = merge_results([
+        dict(files=2, timings={"a.py": 1.0, "c.py": 1.0}, violations=violations[1:]),
+        dict(files=1, timings={"b.py": 2.0}, violations=violations[:1]),
+    ])
+
+    assert_that(result["files"], is_(equal_to(3)))
+    assert_that(result["timings"], has_entries({"a.py": 1.0, "b.py": 2.0, "c.py": 1.0}))
+    assert_that([violation["path"] for violation in result["violations"]], contains("a.py", "b.py"))
@@ -0,0 +1,88 @@
+"""
+Staged content tests.
+
+"""
+from subprocess import check_call
+
+from hamcrest import (
+    assert_that,
+    calling,
+    contains,
+    equal_to,
+    has_entries,
+    has_length,
+    is_,
+    raises,
+)
+
+from logging_format.runner import ResultCache
+from logging_format.staged import iter_staged_blobs, lint_staged, list_staged_paths
+
+
+def make_repository(tmpdir):
+    check_call(["git", "init", "--quiet", str(tmpdir)])
+    tmpdir.mkdir("package").join("example.py").write('logger.warn("Hello World")\n')
+    tmpdir.join("unstaged.py").write('logger.warn("Hello World")\n')
+    tmpdir.join("README.md").write("")
+    check_call(["git", "add", "package/example.py", "README.md"], cwd=str(tmpdir))
+    # working tree changes after staging are not checked
+    tmpdir.join("package", "example.py").write('logger.info(f"Hello {world}")\n')
+
+
+def test_list_staged_paths(tmpdir):
+    """
+    Only staged python files are listed, relative to the top level.
+
+    """
+    make_repository(tmpdir)
+
+    assert_that(list_staged_paths(str(tmpdir)), contains("package/example.py"))
+    assert_that(list_staged_paths(str(tmpdir.join("package")), ["example.py"]), contains("package/example.py"))
+    assert_that(list_staged_paths(str(tmpdir.join("package")), ["missing.py"]), is_(equal_to([])))
+
+
+def test_iter_staged_blobs(tmpdir):
+    """
+    Staged content is read from the object store; paths with nothing staged are skipped.
+
+    """
+    make_repository(tmpdir)
+
+    blobs = list(iter_staged_blobs(["missing.py", "missing file.py", "package/example.py"], cwd=str(tmpdir)))
+
+    assert_that(blobs, has_length(1))
+    path, blob_id, source = blobs[0]
+    assert_that(path, is_(equal_to("package/example.py")))
+    assert_that(blob_id, has_length(40))
+    assert_that(source, is_(equal_to(b'logger.warn("Hello World")\n')))
+
+
+def test_iter_staged_blobs_stopped_early(tmpdir):
+    """
+    A consumer that stops early, or fails, stops git without masking its own error.
+
+    """
+    make_repository(tmpdir)
+    paths = ["package/example.py"] * 10000
+
+    blobs = iter_staged_blobs(paths, cwd=str(tmpdir))
+    next(blobs)
+    blobs.close()
+
+    blobs = iter_staged_blobs(paths, cwd=str(tmpdir))
+    next(blobs)
+    assert_that(calling(blobs.throw).with_args(KeyError("consumer")), raises(KeyError))
+
+
+def test_lint_staged(tmpdir):
+    """
+    Staged content is linted and cached by blob id.
+
+    """
+    make_repository(tmpdir)
+    cache = ResultCache()
+
+    violations = lint_staged(cwd=str(tmpdir), cache=cache)
+
+    assert_that(violations, contains(has_entries(path="package/example.py", code="G010")))
+    assert_that(list(cache.results["package/example.py"][1]), is_(equal_to(violations)))
@@ -22,12 +22,23 @@ from logging_format.violations import (
     STRING_CONCAT_VIOLATION,
     STRING_FORMAT_VIOLATION,
     FSTRING_VIOLATION,
+    NON_CONSTANT_TEMPLATE_VIOLATION,
     WARN_VIOLATION,
     WHITELIST_VIOLATION,
     EXTRA_ATTR_CLASH_VIOLATION,
+    EXTRA_KEYS_BUDGET_VIOLATION,
+    EXTRA_DEPTH_BUDGET_VIOLATION,
+    EXTRA_LARGE_OBJECT_VIOLATION,
     EXCEPTION_VIOLATION,
     ERROR_EXC_INFO_VIOLATION,
     REDUNDANT_EXC_INFO_VIOLATION,
+    STACK_INFO_VIOLATION,
+    LOW_LEVEL_EXC_INFO_VIOLATION,
+    LOOP_EXC_INFO_VIOLATION,
+    TRACEBACK_VIOLATION,
+    BLOCKING_HANDLER_VIOLATION,
+    ATTACHED_BLOCKING_HANDLER_VIOLATION,
+    ASYNC_UNQUEUED_VIOLATION,
 )
 from logging_format.visitor import LoggingVisitor, RESERVED_ATTRS
 from logging_format.whitelist import Whitelist
@@ -297,6 +308,93 @@ def test_extra_with_non_whitelisted_dict_keyword():
     assert_that(visitor.violations[0][1], is_(equal_to(WHITELIST_VIOLATION.format("hello"))))
 
 
+def test_extra_keys_budget():
+    """
+    Extra arguments with too many fields are not ok.
+
+    """
+    tree = parse(dedent("""\
+        import logging
+
+        logging.info("Hello World", extra=dict(a=1, b=2, c=3))
+        logging.info("Hello World", extra={"a": 1, "b": 2})
+    """))
+    visitor = LoggingVisitor(max_extra_keys=2)
+    visitor.visit(tree)
+
+    assert_that(visitor.violations, has_length(1))
+    assert_that(visitor.violations[0][1], is_(equal_to(EXTRA_KEYS_BUDGET_VIOLATION.format(3))))
+
+
+def test_extra_depth_budget():
+    """
+    Extra fields with deeply nested literals are not ok.
+
+    """
+    tree = parse(dedent("""\
+        import logging
+
+        logging.info("Hello World", extra=dict(
+            world=dict(title="Earth", moons=[{"title": "Moon"}]),
+            planets=["Earth", "Mars"],
+        ))
+    """))
+    visitor = LoggingVisitor(max_extra_depth=2)
+    visitor.visit(tree)
+
+    assert_that(visitor.violations, has_length(1))
+    assert_that(visitor.violations[0][1], is_(equal_to(EXTRA_DEPTH_BUDGET_VIOLATION.format("world"))))
+
+
+def test_extra_large_objects():
+    """
+    Extra fields with whole payloads or namespaces are not ok.
+
+    """
+    tree = parse(dedent("""\
+        import logging
+
+        logging.info("Hello World", extra={
+            "payload": request.json,
+            "result": self.response.json(),
+            "scope": locals(),
+            "user": vars(user),
+            "note": note.text,
+            "rate": freq.data,
+            "body": http_req.body,
+        })
+    """))
+    visitor = LoggingVisitor()
+    visitor.visit(tree)
+
+    assert_that(
+        [violation for _, violation in visitor.violations],
+        contains(*[
+            EXTRA_LARGE_OBJECT_VIOLATION.format(key)
+            for key in ("payload", "result", "scope", "user", "body")
+        ]),
+    )
+
+
+def test_extra_budget_non_string_keys():
+    """
+    Keys that are not strings are not named in budget violations.
+
+    """
+    tree = parse(dedent("""\
+        import logging
+
+        logging.info("Hello World", extra={1: [[["deep"]]], "scope": locals()})
+    """))
+    visitor = LoggingVisitor()
+    visitor.visit(tree)
+
+    assert_that(
+        [violation for _, violation in visitor.violations],
+        contains(EXTRA_LARGE_OBJECT_VIOLATION.format("scope")),
+    )
+
+
 def test_string_format():
     """
     String formatting is not ok in logging statements.
@@ -565,6 +663,59 @@ def test_exception_as_formatting_arg():
     assert_that(visitor.violations[0][1], is_(equal_to(EXCEPTION_VIOLATION)))
 
 
+def test_exception_repr_as_formatting_arg():
+    """
+    In an except block, passing repr of the exception into logging as a formatting argument is not ok.
+
+    """
+    tree = parse(dedent("""\
+        import logging
+
+        try:
+            pass
+        except Exception as e:
+            logging.warning('Exception occurred: %r', repr(e))
+    """))
+    visitor = LoggingVisitor()
+    visitor.visit(tree)
+
+    assert_that(visitor.violations, has_length(1))
+    assert_that(visitor.violations[0][1], is_(equal_to(EXCEPTION_VIOLATION)))
+
+
+def test_traceback_formatting():
+    """
+    Formatting a traceback anywhere in the arguments, including extra values, is not ok.
+
+    """
+    tree = parse(dedent("""\
+        import logging
+        import traceback
+        from traceback import format_exception
+
+        try:
+            pass
+        except Exception as e:
+            logging.error('Failed: %s', traceback.format_exc())
+            logging.error('Failed: %s', "".join(format_exception(type(e), e, e.__traceback__)))
+            logging.warning('Failed', extra=dict(stack=traceback.format_stack()))
+            logging.error('Failed', exc_info=True)
+            formatted = traceback.format_exc()
+    """))
+    visitor = LoggingVisitor()
+    visitor.visit(tree)
+
+    assert_that(
+        [(node.lineno, reason) for node, reason in visitor.violations],
+        contains(
+            (8, TRACEBACK_VIOLATION.format("format_exc")),
+            (9, TRACEBACK_VIOLATION.format("format_exception")),
+            (10, TRACEBACK_VIOLATION.format("format_stack")),
+            (11, ERROR_EXC_INFO_VIOLATION),
+        ),
+    )
+
+
 def test_exception_in_extra():
     """
     In an except block, passing the exception into logging as a value of extra dict is not ok.
@@ -646,6 +797,68 @@ def test_exception_exc_info():
     assert_that(visitor.violations[0][1], is_(equal_to(REDUNDANT_EXC_INFO_VIOLATION)))
 
 
+def test_stack_info():
+    """
+    stack_info=True should only be used at error levels.
+
+    """
+    tree = parse(dedent("""\
+        import logging
+
+        logging.warning('Hello World', stack_info=True)
+        logging.info('Hello World', stack_info=False)
+        logging.critical('Hello World', stack_info=True)
+    """))
+    visitor = LoggingVisitor()
+    visitor.visit(tree)
+
+    assert_that(visitor.violations, has_length(1))
+    assert_that(visitor.violations[0][1], is_(equal_to(STACK_INFO_VIOLATION)))
+
+
+def test_low_level_exc_info():
+    """
+    exc_info at debug or info level is only ok within an except block.
+
+    """
+    tree = parse(dedent("""\
+        import logging
+
+        logging.debug('Hello World', exc_info=True)
+        try:
+            pass
+        except Exception:
+            logging.info('Hello World', exc_info=True)
+            logging.debug('Hello World', exc_info=False)
+    """))
+    visitor = LoggingVisitor()
+    visitor.visit(tree)
+
+    assert_that(visitor.violations, has_length(1))
+    assert_that(visitor.violations[0][1], is_(equal_to(LOW_LEVEL_EXC_INFO_VIOLATION)))
+
+
+def test_loop_exc_info():
+    """
+    exc_info at debug or info level inside a loop is not ok, even within an except block.
+
+    """
+    tree = parse(dedent("""\
+        import logging
+
+        for item in items:
+            try:
+                pass
+            except Exception as error:
+                logging.debug('Hello World', exc_info=error)
+    """))
+    visitor = LoggingVisitor()
+    visitor.visit(tree)
+
+    assert_that(visitor.violations, has_length(1))
+    assert_that(visitor.violations[0][1], is_(equal_to(LOOP_EXC_INFO_VIOLATION)))
+
+
 def test_app_log():
     """
     Detect nested loggers.
@@ -697,3 +910,205 @@ def test_argparse_parser_error():
     visitor.visit(tree)
 
     assert_that(visitor.violations, is_(empty()))
+
+
+def test_preformatted_message_variable():
+    """
+    Formatting a message into a local variable is no better than formatting inline.
+
+    """
+    tree = parse(dedent("""\
+        import logging
+
+        def greet(world):
+            fmsg = f"Hello {world}"
+            logging.info(fmsg)
+            pmsg = "Hello %s" % world
+            logging.info(pmsg)
+            smsg = "Hello {}".format(world)
+            logging.info(smsg)
+            cmsg = "Hello "
+            cmsg += world
+            logging.info(cmsg)
+    """))
+    visitor = LoggingVisitor()
+    visitor.visit(tree)
+
+    assert_that(
+        [(node.lineno, violation) for node, violation in visitor.violations],
+        contains(
+            (4, FSTRING_VIOLATION),
+            (6, PERCENT_FORMAT_VIOLATION),
+            (8, STRING_FORMAT_VIOLATION),
+            (11, STRING_CONCAT_VIOLATION),
+        ),
+    )
+
+
+def test_preformatted_message_variable_branches():
+    """
+    Definitions reaching the logging call from any branch are reported once.
+
+    """
+    tree = parse(dedent("""\
+        import logging
+
+        def greet(world):
+            msg = "Hello World"
+            if world:
+                msg = f"Hello {world}"
+            logging.info(msg)
+            logging.warning(msg)
+    """))
+    visitor = LoggingVisitor()
+    visitor.visit(tree)
+
+    assert_that(visitor.violations, has_length(1))
+    assert_that(visitor.violations[0][0].lineno, is_(equal_to(6)))
+    assert_that(visitor.violations[0][1], is_(equal_to(FSTRING_VIOLATION)))
+
+
+def test_preformatted_message_variable_rebound():
+    """
+    Rebinding the variable, or using it outside of the defining function, is fine.
+
+    """
+    tree = parse(dedent("""\
+        import logging
+
+        msg = f"Hello {world}"
+
+        def greet(world):
+            logging.info(msg)
+            greeting = f"Hello {world}"
+            greeting, _ = "Hello World", None
+            logging.info(greeting)
+    """))
+    visitor = LoggingVisitor()
+    visitor.visit(tree)
+
+    assert_that(visitor.violations, is_(empty()))
+
+
+def test_blocking_handlers_in_async_module():
+    """
+    Blocking handlers are reported once, where attached if they are, along with unqueued async logging.
+
+    """
+    tree = parse(dedent("""\
+        import logging
+        from logging.handlers import SysLogHandler
+
+        logger = logging.getLogger(__name__)
+        handler = logging.FileHandler("service.log")
+        logger.addHandler(handler)
+        logger.addHandler(SysLogHandler())
+        formatter = logging.StreamHandler()
+
+        def setup():
+            logger.info("Sync setup")
+
+        async def handle(request):
+            logger.info("Handling request")
+    """))
+    visitor = LoggingVisitor()
+    visitor.visit(tree)
+
+    assert_that(
+        [(node.lineno, reason) for node, reason in sorted(visitor.violations, key=lambda item: item[0].lineno)],
+        contains(
+            (6, ATTACHED_BLOCKING_HANDLER_VIOLATION.format("FileHandler")),
+            (7, ATTACHED_BLOCKING_HANDLER_VIOLATION.format("SysLogHandler")),
+            (8, BLOCKING_HANDLER_VIOLATION.format("StreamHandler")),
+            (14, ASYNC_UNQUEUED_VIOLATION),
+        ),
+    )
+
+
+def test_blocking_handlers_behind_queue_listener():
+    """
+    Handlers run by a QueueListener, and handlers in modules without asyncio, are fine.
+
+    """
+    queued = parse(dedent("""\
+        import asyncio
+        import logging
+        from logging.handlers import QueueHandler, QueueListener
+
+        handler = logging.FileHandler("service.log")
+        listener = QueueListener(queue, handler, logging.StreamHandler())
+        logging.getLogger().addHandler(QueueHandler(queue))
+
+        async def handle(request):
+            logging.info("Handling request")
+    """))
+    synchronous = parse(dedent("""\
+        import logging
+
+        logging.getLogger().addHandler(logging.FileHandler("service.log"))
+    """))
+
+    for tree in (queued, synchronous):
+        visitor = LoggingVisitor()
+        visitor.visit(tree)
+
+        assert_that(visitor.violations, is_(empty()))
+
+
+def test_non_constant_template():
+    """
+    With constant templates enabled, templates that cannot be catalogued are reported once.
+
+    """
+    tree = parse(dedent("""\
+        import logging
+
+        GREETING = "Hello World"
+
+        def greet(world, message, messages):
+            logging.info(GREETING)
+            greeting = "Hello %s"
+            logging.info(greeting, world)
+            logging.info(f"Hello World")
+            logging.info(message)
+            logging.info(messages[world])
+            logging.info(f"Hello {world}")
+            preformatted = "Hello {}".format(world)
+            logging.info(preformatted)
+            logging.info(FAREWELL)
+            logging.info(CLASS_GREETING)
+            logging.info(CHANGING)
+
+        class Messages(object):
+            CLASS_GREETING = "Hello"
+
+        FAREWELL = "Goodbye World"
+        CHANGING = "Hello"
+        CHANGING = "Goodbye"
+
+        def shadow(GREETING, farewells):
+            logging.info(GREETING)
+            for FAREWELL in farewells:
+                logging.info(FAREWELL)
+    """))
+    visitor = LoggingVisitor(constant_templates=True)
+    visitor.visit(tree)
+
+    assert_that(
+        [(node.lineno, reason) for node, reason in visitor.violations],
+        contains(
+            (10, NON_CONSTANT_TEMPLATE_VIOLATION),
+            (11, NON_CONSTANT_TEMPLATE_VIOLATION),
+            (12, FSTRING_VIOLATION),
+            (13, STRING_FORMAT_VIOLATION),
+            (16, NON_CONSTANT_TEMPLATE_VIOLATION),
+            (17, NON_CONSTANT_TEMPLATE_VIOLATION),
+            (27, NON_CONSTANT_TEMPLATE_VIOLATION),
+            (29, NON_CONSTANT_TEMPLATE_VIOLATION),
+        ),
+    )
+
+    visitor = LoggingVisitor()
+    visitor.visit(tree)
+
+    assert_that(visitor.violations, has_length(2))
@@ -0,0 +1,101 @@
+"""
+Watch mode tests.
+
+"""
+from io import StringIO
+from os import utime
+from threading import Thread
+from time import sleep, time
+
+from hamcrest import (
+    assert_that,
+    contains_string,
+    equal_to,
+    is_,
+)
+
+from logging_format.runner import ResultCache
+from logging_format.watch import PollingWatcher, relint, watch
+
+
+def test_result_cache():
+    """
+    Results are reused while the source is unchanged and the total is kept up to date.
+
+    """
+    cache = ResultCache()
+
+    violations = cache.lint("example.py", b'logger.info(f"Hello {world}")\n')
+    assert_that(cache.lint("example.py", b'logger.info(f"Hello {world}")\n'), is_(violations))
+    assert_that(cache.count, is_(equal_to(1)))
+
+    cache.lint("example.py", b'logger.info("Hello World")\n')
+    assert_that(cache.count, is_(equal_to(0)))
+
+    cache.lint("other.py", b'logger.warn("Hello World")\n')
+    cache.discard("other.py")
+    assert_that(cache.count, is_(equal_to(0)))
+    assert_that(len(cache), is_(equal_to(1)))
+
+
+def test_polling_watcher(tmpdir):
+    """
+    Modified, created and deleted files are reported.
+
+    """
+    example = tmpdir.join("example.py")
+    example.write("")
+    tmpdir.join("removed.py").write("")
+    watcher = PollingWatcher([str(tmpdir)], interval=0)
+
+    example.write('logger.info("Hello World")\n')
+    utime(str(example), (0, 0))
+    tmpdir.join("created.py").write("")
+    tmpdir.join("removed.py").remove()
+
+    assert_that(watcher.read(0), is_(equal_to({
+        str(tmpdir.join(name)) for name in ("example.py", "created.py", "removed.py")
+    })))
+    assert_that(watcher.read(0), is_(equal_to(set())))
+
+
+def test_relint_moved_directory(tmpdir):
+    """
+    Results for every file under a directory that was moved away are dropped.
+
+    """
+    package = tmpdir.mkdir("package")
+    package.join("example.py").write('logger.info(f"Hello {world}")\n')
+    tmpdir.join("other.py").write('logger.info(f"Hello {world}")\n')
+    cache = ResultCache()
+    relint(cache, [str(package.join("example.py")), str(tmpdir.join("other.py"))])
+
+    package.move(tmpdir.join("moved"))
+    relint(cache, [str(package)])
+
+    assert_that(sorted(cache.results), is_(equal_to([str(tmpdir.join("other.py"))])))
+    assert_that(cache.count, is_(equal_to(1)))
+
+
+def test_watch(tmpdir):
+    """
+    Saving a file updates the total violation count.
+
+    """
+    example = tmpdir.join("example.py")
+    example.write('logger.info("Hello World")\n')
+    outfile = StringIO()
+
+    thread = Thread(target=watch, args=([str(tmpdir)], outfile), kwargs=dict(debounce=0.05, iterations=1))
+    thread.start()
+    # wait for the initial scan before saving
+    deadline = time() + 10
+    while not outfile.getvalue() and time() < deadline:
+        sleep(0.01)
+    assert_that(outfile.getvalue(), contains_string("0 violations in 1 files"))
+    example.write('logger.info(f"Hello {world}")\n')
+    thread.join(timeout=10)
+
+    assert_that(thread.is_alive(), is_(equal_to(False)))
+    assert_that(outfile.getvalue(), contains_string("G004"))
+    assert_that(outfile.getvalue(), contains_string("1 violations in 1 files"))
@@ -2,11 +2,101 @@
 Test whitelist.
 
 """
-from hamcrest import assert_that, contains
+from argparse import Namespace
+from ast import parse
+from json import dump, load
 
-from logging_format.whitelist import Whitelist
+from hamcrest import (
+    assert_that,
+    contains,
+    equal_to,
+    is_,
+    none,
+)
+
+from logging_format import api
+from logging_format.api import LoggingFormatValidator
+from logging_format.whitelist import Whitelist, load_snapshot, write_snapshot
 
 
 def test_whitelist():
     whitelist = Whitelist(group="logging.extra.example")
     assert_that(whitelist.legal_keys, contains("world"))
+
+
+def test_whitelist_snapshot(tmpdir):
+    """
+    An up to date snapshot is used instead of loading the providers.
+
+    """
+    path = str(tmpdir.join("whitelist.json"))
+    write_snapshot(path, group="logging.extra.example")
+
+    with open(path) as infile:
+        snapshot = load(infile)
+    assert_that(snapshot["legal_keys"], contains("world"))
+
+    snapshot["legal_keys"] = ["hello"]
+    with open(path, "w") as outfile:
+        dump(snapshot, outfile)
+
+    whitelist = Whitelist(group="logging.extra.example", snapshot=path)
+    assert_that(whitelist.legal_keys, is_(equal_to({"hello"})))
+
+
+def test_stale_whitelist_snapshot(tmpdir):
+    """
+    Stale, missing or invalid snapshots fall back to loading the providers.
+
+    """
+    path = str(tmpdir.join("whitelist.json"))
+    write_snapshot(path, group="logging.extra.example")
+
+    with open(path) as infile:
+        snapshot = load(infile)
+    snapshot.update(fingerprint="stale", legal_keys=["hello"])
+    with open(path, "w") as outfile:
+        dump(snapshot, outfile)
+
+    assert_that(load_snapshot(path, group="logging.extra.example"), is_(none()))
+    assert_that(load_snapshot(str(tmpdir.join("missing.json"))), is_(none()))
+    assert_that(Whitelist(group="logging.extra.example", snapshot=path).legal_keys, contains("world"))
+
+
+def test_validator_resolves_whitelist_once(monkeypatch):
+    """
+    The flake8 plugin resolves the whitelist when its options are parsed, not for every file.
+
+    """
+    resolved = []
+
+    def make_whitelist(snapshot=None):
+        resolved.append(snapshot)
+        return Whitelist(group="logging.extra.example")
+
+    monkeypatch.setattr(api, "Whitelist", make_whitelist)
+    # restore the options parsed below once the test is done
+    for name, value in list(vars(LoggingFormatValidator).items()):
+        if not name.startswith("_") and not callable(value) and not isinstance(value, classmethod):
+            monkeypatch.setattr(LoggingFormatValidator, name, value)
+
+    LoggingFormatValidator.parse_options(Namespace(
+        enable_extra_whitelist=True,
+        enable_constant_templates=False,
+        enable_logging_flag_opt_outs=False,
+        extra_whitelist_snapshot="whitelist.json",
+        max_extra_keys=None,
+        max_extra_depth=None,
+        logger_index=None,
+        max_file_bytes=None,
+        max_file_nodes=None,
+        max_file_seconds=None,
+        degraded_mode="scan",
+        formatter_field_severity=None,
+    ))
+    lines = ['logger.info("Hello", extra=dict(hello="World"))\n']
+    for _ in range(2):
+        violations = [violation[2] for violation in LoggingFormatValidator(parse("".join(lines)), "x.py", lines).run()]
+        assert_that(violations, contains("G100 Logging statement uses non-whitelisted extra keyword argument: hello"))
+
+    assert_that(resolved, is_(equal_to(["whitelist.json"])))
@@ -11,12 +11,34 @@ PERCENT_FORMAT_VIOLATION = "G002 Logging statement uses '%'"
 
 FSTRING_VIOLATION = "G004 Logging statement uses f-string"
 
+NON_CONSTANT_TEMPLATE_VIOLATION = "G005 Logging statement uses a message template that is not constant"
+
 WARN_VIOLATION = "G010 Logging statement uses 'warn' instead of 'warning'"
 
 WHITELIST_VIOLATION = "G100 Logging statement uses non-whitelisted extra keyword argument: {}"
 EXTRA_ATTR_CLASH_VIOLATION = "G101 Logging statement uses an extra field that clashes with a LogRecord field: {}"
+EXTRA_KEYS_BUDGET_VIOLATION = "G102 Logging statement uses too many extra fields: {}"
+EXTRA_DEPTH_BUDGET_VIOLATION = "G103 Logging statement uses an extra field with deeply nested values: {}"
+EXTRA_LARGE_OBJECT_VIOLATION = "G104 Logging statement uses a large object as an extra field: {}"
 
 EXCEPTION_VIOLATION = "G200 Logging statement uses exception in arguments"
 
 ERROR_EXC_INFO_VIOLATION = "G201 Logging: .exception(...) should be used instead of .error(..., exc_info=True)"
 REDUNDANT_EXC_INFO_VIOLATION = "G202 Logging statement has redundant exc_info"
+STACK_INFO_VIOLATION = "G203 Logging statement uses stack_info at a non-error level"
+LOW_LEVEL_EXC_INFO_VIOLATION = "G204 Logging statement uses exc_info at debug/info level outside of an except block"
+LOOP_EXC_INFO_VIOLATION = "G205 Logging statement uses exc_info at debug/info level inside a loop"
+TRACEBACK_VIOLATION = "G206 Logging statement formats a traceback eagerly, use exc_info=True or exception(): {}"
+
+BLOCKING_HANDLER_VIOLATION = "G300 Logging handler blocks the event loop, use QueueHandler and QueueListener: {}"
+ATTACHED_BLOCKING_HANDLER_VIOLATION = "G301 Logging statement attaches a blocking handler in an async module: {}"
+ASYNC_UNQUEUED_VIOLATION = "G302 Logging statement in async function is not routed through a QueueHandler"
+
+CONFIG_NETWORK_HANDLER_VIOLATION = "G400 Logging configuration uses a synchronous network handler: {}"
+CONFIG_DEBUG_LEVEL_VIOLATION = "G401 Logging configuration sets a logger to DEBUG: {}"
+CONFIG_FRAME_FIELD_VIOLATION = "G402 Logging configuration formats fields that inspect the caller's frame: {}"
+FORMATTER_HIGH_COST_VIOLATION = "G403 Logging formatter uses fields with a high per-record cost: {}"
+FORMATTER_LOW_COST_VIOLATION = "G404 Logging formatter uses fields with a per-record cost: {}"
+LOGGING_FLAGS_VIOLATION = "G405 Logging is configured without opting out of: {}"
+
+DEGRADED_MODE_VIOLATION = "G900 Logging checks ran in degraded mode ({}): {}"
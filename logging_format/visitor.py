@@ -2,34 +2,97 @@
 AST Visitor to identify logging expressions.
 
 """
+from collections import namedtuple
 from sys import version_info
 
 from ast import (
     Add,
+    AnnAssign,
+    arg,
+    Assign,
+    AsyncFunctionDef,
+    Attribute,
+    AugAssign,
+    BinOp,
     Call,
+    ClassDef,
+    Dict,
+    FunctionDef,
+    Import,
+    ImportFrom,
+    Lambda,
+    JoinedStr,
+    List,
     keyword,
     iter_child_nodes,
+    literal_eval,
     Mod,
+    Load,
     Name,
     NodeVisitor,
+    Set,
+    Tuple,
+    walk,
 )
 
+from logging_format.config import (
+    DEFAULT_FIELD_SEVERITIES,
+    LOGGING_FLAGS,
+    check_dict_config,
+    evaluate_literal,
+    find_entry_node,
+    get_dict_config_fields,
+    get_format_fields,
+    is_literal,
+)
 from logging_format.violations import (
     PERCENT_FORMAT_VIOLATION,
     STRING_CONCAT_VIOLATION,
     STRING_FORMAT_VIOLATION,
     FSTRING_VIOLATION,
+    NON_CONSTANT_TEMPLATE_VIOLATION,
     WARN_VIOLATION,
     WHITELIST_VIOLATION,
     EXTRA_ATTR_CLASH_VIOLATION,
+    EXTRA_KEYS_BUDGET_VIOLATION,
+    EXTRA_DEPTH_BUDGET_VIOLATION,
+    EXTRA_LARGE_OBJECT_VIOLATION,
     EXCEPTION_VIOLATION,
     ERROR_EXC_INFO_VIOLATION,
     REDUNDANT_EXC_INFO_VIOLATION,
+    STACK_INFO_VIOLATION,
+    LOW_LEVEL_EXC_INFO_VIOLATION,
+    LOOP_EXC_INFO_VIOLATION,
+    TRACEBACK_VIOLATION,
+    BLOCKING_HANDLER_VIOLATION,
+    ATTACHED_BLOCKING_HANDLER_VIOLATION,
+    ASYNC_UNQUEUED_VIOLATION,
+    FORMATTER_HIGH_COST_VIOLATION,
+    FORMATTER_LOW_COST_VIOLATION,
+    LOGGING_FLAGS_VIOLATION,
 )
 
 if version_info >= (3, 6):
     from ast import FormattedValue
 
+if version_info >= (3, 8):
+    from ast import Constant
+else:
+    from ast import Str
+
+
+# levels at which attaching exception or stack information is expected
+ERROR_LEVELS = {
+    "critical",
+    "error",
+    "exception",
+}
+
+# levels that are usually disabled or high volume in production
+LOW_LEVELS = {
+    "debug",
+    "info",
+}
 
 LOGGING_LEVELS = {
     "debug",
@@ -42,6 +105,70 @@ LOGGING_LEVELS = {
 }
 
 
+# default budget for the payload of a logging call's extra argument
+DEFAULT_MAX_EXTRA_KEYS = 20
+DEFAULT_MAX_EXTRA_DEPTH = 2
+
+# calls and attributes that evaluate to objects too large to ship with every record
+LARGE_OBJECT_CALLS = {
+    "dir",
+    "globals",
+    "locals",
+    "vars",
+}
+LARGE_OBJECT_ATTRIBUTES = {
+    "__dict__",
+}
+# payload attributes, only considered large on request and response objects
+PAYLOAD_ATTRIBUTES = {
+    "body",
+    "content",
+    "data",
+    "json",
+    "text",
+}
+PAYLOAD_RECEIVER_NAMES = {"request", "response", "req", "resp"}
+
+# traceback functions that format (or print) a whole traceback when called
+TRACEBACK_FUNCTIONS = {
+    "format_exc",
+    "format_exception",
+    "format_stack",
+    "format_tb",
+    "print_exc",
+    "print_stack",
+}
+
+# handlers that do synchronous I/O in the thread that logs, stalling an event loop
+BLOCKING_HANDLERS = {
+    "FileHandler",
+    "HTTPHandler",
+    "RotatingFileHandler",
+    "SMTPHandler",
+    "SocketHandler",
+    "StreamHandler",
+    "SysLogHandler",
+    "TimedRotatingFileHandler",
+    "WatchedFileHandler",
+}
+# calls that configure logging as a whole
+LOGGING_CONFIG_CALLS = {
+    "basicConfig",
+    "dictConfig",
+    "fileConfig",
+}
+
+# calls that set up handlers, and those that move their I/O off the logging thread
+HANDLER_SETUP_CALLS = {
+    "addHandler",
+    "basicConfig",
+}
+QUEUE_HANDLERS = {
+    "QueueHandler",
+    "QueueListener",
+}
+
+
 # default LogRecord attributes that shouldn't be overwritten by extra dict
 RESERVED_ATTRS = {
     "args", "asctime", "created", "exc_info", "exc_text", "filename",
@@ -50,17 +177,264 @@ RESERVED_ATTRS = {
     "processName", "relativeCreated", "stack_info", "thread", "threadName"}
 
 
+def get_string_value(node):
+    """
+    Return the value of a string literal node, or None for any other node.
+
+    """
+    if version_info >= (3, 8):
+        if isinstance(node, Constant) and isinstance(node.value, str):
+            return node.value
+        return None
+    if isinstance(node, Str):
+        return node.s
+    return None
+
+
+def get_template_value(node):
+    """
+    Return the value of a constant message template: a string literal or an f-string without fields.
+
+    """
+    value = get_string_value(node)
+    if value is None and version_info >= (3, 6) and isinstance(node, JoinedStr):
+        parts = [get_string_value(part) for part in node.values]
+        if None not in parts:
+            return "".join(parts)
+    return value
+
+
+def iter_module_nodes(node):
+    """
+    Walk a module-level statement, without entering function, lambda or class bodies.
+
+    """
+    yield node
+    if not isinstance(node, (AsyncFunctionDef, ClassDef, FunctionDef, Lambda)):
+        for child in iter_child_nodes(node):
+            for descendant in iter_module_nodes(child):
+                yield descendant
+
+
+def get_module_constants(statements):
+    """
+    Map the module-level names only ever bound to the same constant template to that template.
+
+    Every module-level binding counts, wherever it is in the module, so the result does not depend
+    on the order of definitions. Bindings in function and class bodies are not module-level.
+
+    """
+    templates = {}
+    for statement in statements:
+        assigned = set()
+        for node in iter_module_nodes(statement):
+            if isinstance(node, (Assign, AnnAssign)) and node.value is not None:
+                template = get_template_value(node.value)
+                for target in node.targets if isinstance(node, Assign) else [node.target]:
+                    if isinstance(target, Name):
+                        assigned.add(id(target))
+                        templates.setdefault(target.id, set()).add(template)
+            elif isinstance(node, Name) and not isinstance(node.ctx, Load) and id(node) not in assigned:
+                # any other binding, e.g. a loop target or part of a tuple or augmented assignment
+                templates.setdefault(node.id, set()).add(None)
+            elif isinstance(node, (AsyncFunctionDef, ClassDef, FunctionDef)):
+                templates.setdefault(node.name, set()).add(None)
+            elif isinstance(node, (Import, ImportFrom)):
+                for alias in node.names:
+                    templates.setdefault((alias.asname or alias.name).split(".")[0], set()).add(None)
+
+    return {
+        name: values.pop()
+        for name, values in templates.items()
+        if len(values) == 1 and None not in values
+    }
+
+
+def is_falsy_literal(node):
+    """
+    Is the node a literal such as False, None or 0?
+
+    """
+    try:
+        return not literal_eval(node)
+    except (TypeError, ValueError):
+        return False
+
+
+def is_dict_call(node):
+    return isinstance(node, Call) and isinstance(node.func, Name) and node.func.id == "dict"
+
+
+def get_extra_items(node):
+    """
+    List the string keys of a literal `extra` dict or `dict(...)` call with their values, or None for other values.
+
+    """
+    if isinstance(node, Dict):
+        return [
+            (get_string_value(key), value)
+            for key, value in zip(node.keys, node.values)
+            if key is not None and get_string_value(key) is not None
+        ]
+    if is_dict_call(node):
+        return [(item.arg, item.value) for item in node.keywords if item.arg is not None]
+    return None
+
+
+def get_literal_depth(node):
+    """
+    How deeply are dict, list, tuple and set literals nested in an expression?
+
+    """
+    if isinstance(node, Dict):
+        children = node.values
+    elif isinstance(node, (List, Set, Tuple)):
+        children = node.elts
+    elif is_dict_call(node):
+        children = [item.value for item in node.keywords]
+    else:
+        return 0
+    return 1 + max([get_literal_depth(child) for child in children] or [0])
+
+
+# where a node was, kept instead of the node by checks that span top-level statements
+Position = namedtuple("Position", ["lineno", "col_offset"])
+
+
+def get_position(node):
+    return Position(node.lineno, node.col_offset)
+
+
+def get_call_name(node):
+    """
+    Name the function called by a call expression, ignoring any module or receiver.
+
+    """
+    if not isinstance(node, Call):
+        return None
+    if isinstance(node.func, Name):
+        return node.func.id
+    if isinstance(node.func, Attribute):
+        return node.func.attr
+    return None
+
+
+def is_blocking_handler(node):
+    return get_call_name(node) in BLOCKING_HANDLERS
+
+
+def get_handler_reference(node):
+    """
+    Refer to a handler passed to a call: by name, by the position and name of its construction, or None.
+
+    """
+    if isinstance(node, Name):
+        return node.id
+    if is_blocking_handler(node):
+        return get_position(node), get_call_name(node)
+    return None
+
+
+def get_local_names(node):
+    """
+    List the names bound anywhere within a function, including its arguments.
+
+    """
+    names = set()
+    for child in walk(node):
+        if isinstance(child, Name) and not isinstance(child.ctx, Load):
+            names.add(child.id)
+        elif isinstance(child, arg):
+            names.add(child.arg)
+        elif isinstance(child, (Import, ImportFrom)):
+            names.update((alias.asname or alias.name).split(".")[0] for alias in child.names)
+    return names
+
+
+def is_large_object(node):
+    """
+    Is the expression something like `locals()`, `vars(obj)`, `request.json` or `response.text`?
+
+    """
+    if isinstance(node, Call):
+        if isinstance(node.func, Name):
+            return node.func.id in LARGE_OBJECT_CALLS
+        node = node.func
+    if not isinstance(node, Attribute):
+        return False
+    if node.attr in LARGE_OBJECT_ATTRIBUTES:
+        return True
+
+    receiver = node.value
+    if isinstance(receiver, Attribute):
+        receiver_name = receiver.attr
+    elif isinstance(receiver, Name):
+        receiver_name = receiver.id
+    else:
+        return False
+    # match whole parts of the name, as in `http_response`, but not `freq`
+    return node.attr in PAYLOAD_ATTRIBUTES and receiver_name.lower().rsplit("_", 1)[-1] in PAYLOAD_RECEIVER_NAMES
+
+
 class LoggingVisitor(NodeVisitor):
 
-    def __init__(self, whitelist=None):
+    def __init__(
+        self,
+        whitelist=None,
+        max_extra_keys=DEFAULT_MAX_EXTRA_KEYS,
+        max_extra_depth=DEFAULT_MAX_EXTRA_DEPTH,
+        logger_aliases=None,
+        field_severities=None,
+        constant_templates=False,
+        logging_flags=False,
+    ):
         super(LoggingVisitor, self).__init__()
         self.current_logging_call = None
         self.current_logging_argument = None
         self.current_logging_level = None
         self.current_extra_keyword = None
         self.current_except_names = []
+        self.current_except_depth = 0
+        self.current_loop_depth = 0
+        # reaching definitions of local names within the current function, if any
+        self.current_definitions = None
+        self.reported_definitions = set()
         self.violations = []
         self.whitelist = whitelist
+        self.max_extra_keys = max_extra_keys
+        self.max_extra_depth = max_extra_depth
+        # module-level names known to be "logger", "factory" or "other", and the names local to each function
+        self.logger_aliases = logger_aliases
+        self.current_local_names = []
+        self.field_severities = field_severities if field_severities is not None else DEFAULT_FIELD_SEVERITIES
+        self.constant_templates = constant_templates
+        self.logging_flags = logging_flags
+        self.reset_module_state()
+
+    def reset_module_state(self):
+        """
+        Reset the state of checks that can only be decided once the whole module is seen.
+
+        """
+        self.current_function_async = False
+        self.async_module = False
+        self.handler_setup = False
+        self.queue_setup = False
+        # blocking handler constructions, the names they are bound to, and those handed to a listener,
+        # kept as positions and names rather than nodes, so that no statement's tree outlives its visit
+        self.blocking_handlers = []
+        self.bound_handlers = {}
+        self.queued_handlers = []
+        self.attached_handlers = []
+        self.async_logging_calls = []
+        # logging configuration calls, the module flags opted out of and the fields formatters use,
+        # unless some formatters are configured outside of the module's literals
+        self.logging_config_calls = []
+        self.disabled_logging_flags = set()
+        self.formatter_fields = set()
+        self.formatter_fields_unknown = False
+        # module-level names bound to constant strings, usable as message templates, by name
+        self.module_constants = {}
 
     def within_logging_statement(self):
         return self.current_logging_call is not None
@@ -71,6 +445,12 @@ class LoggingVisitor(NodeVisitor):
     def within_extra_keyword(self, node):
         return self.current_extra_keyword is not None and self.current_extra_keyword != node
 
+    def within_except_block(self):
+        return self.current_except_depth > 0
+
+    def within_loop(self):
+        return self.current_loop_depth > 0
+
     def visit_Call(self, node):
         """
         Visit a function call.
@@ -80,9 +460,10 @@ class LoggingVisitor(NodeVisitor):
         """
         # CASE 1: We're in a logging statement
         if self.within_logging_statement():
+            self.check_traceback_call(node)
             if self.within_logging_argument() and self.is_format_call(node):
                 self.violations.append((node, STRING_FORMAT_VIOLATION))
-                super(LoggingVisitor, self).generic_visit(node)
+                self.generic_visit(node)
                 return
 
         logging_level = self.detect_logging_level(node)
@@ -92,16 +473,28 @@ class LoggingVisitor(NodeVisitor):
 
         # CASE 2: We're in some other statement
         if logging_level is None:
-            super(LoggingVisitor, self).generic_visit(node)
+            self.check_handler_call(node)
+            self.check_dict_config_call(node)
+            self.check_formatter_call(node)
+            self.generic_visit(node)
             return
 
         # CASE 3: We're entering a new logging statement
         self.current_logging_call = node
 
+        if self.current_function_async:
+            self.async_logging_calls.append(get_position(node))
+
         if logging_level == "warn":
             self.violations.append((node, WARN_VIOLATION))
 
         self.check_exc_info(node)
+        self.check_low_level_exc_info(node)
+        self.check_stack_info(node)
+        if node.args:
+            self.check_message_definitions(node.args[0])
+            if self.constant_templates:
+                self.check_constant_template(node.args[0])
 
         for index, child in enumerate(iter_child_nodes(node)):
             if index == 1:
@@ -110,8 +503,9 @@ class LoggingVisitor(NodeVisitor):
                 self.check_exception_arg(child)
             if index > 1 and isinstance(child, keyword) and child.arg == "extra":
                 self.current_extra_keyword = child
+                self.check_extra_budget(child.value)
 
-            super(LoggingVisitor, self).visit(child)
+            self.visit(child)
 
             self.current_logging_argument = None
             self.current_extra_keyword = None
@@ -191,20 +585,236 @@ class LoggingVisitor(NodeVisitor):
         Process except blocks.
 
         """
+        self.current_except_depth += 1
         name = self.get_except_handler_name(node)
         if not name:
             super(LoggingVisitor, self).generic_visit(node)
+            self.current_except_depth -= 1
             return
 
         self.current_except_names.append(name)
         super(LoggingVisitor, self).generic_visit(node)
         self.current_except_names.pop()
+        self.current_except_depth -= 1
+
+    def visit_For(self, node):
+        """
+        Process for loops.
+
+        The iterable is evaluated once; the body runs on every iteration.
+
+        """
+        self.visit(node.iter)
+        before = self.copy_definitions()
+        self.current_loop_depth += 1
+        self.visit(node.target)
+        for child in node.body:
+            self.visit(child)
+        self.current_loop_depth -= 1
+        # the body may not run at all
+        self.merge_definitions(before)
+        for child in node.orelse:
+            self.visit(child)
+
+    visit_AsyncFor = visit_For
+
+    def visit_While(self, node):
+        """
+        Process while loops.
+
+        """
+        before = self.copy_definitions()
+        self.current_loop_depth += 1
+        self.visit(node.test)
+        for child in node.body:
+            self.visit(child)
+        self.current_loop_depth -= 1
+        self.merge_definitions(before)
+        for child in node.orelse:
+            self.visit(child)
+
+    def visit_comprehension_expression(self, node):
+        """
+        Process list, set and dict comprehensions and generator expressions.
+
+        """
+        self.current_loop_depth += 1
+        super(LoggingVisitor, self).generic_visit(node)
+        self.current_loop_depth -= 1
+
+    visit_ListComp = visit_SetComp = visit_DictComp = visit_GeneratorExp = visit_comprehension_expression
+
+    def visit_FunctionDef(self, node, is_async=False):
+        """
+        Process function definitions.
+
+        A function body defined inside a loop does not itself run in that loop, and starts
+        with no local definitions.
+
+        """
+        loop_depth, self.current_loop_depth = self.current_loop_depth, 0
+        definitions, self.current_definitions = self.current_definitions, {}
+        function_async, self.current_function_async = self.current_function_async, is_async
+        self.current_local_names.append(get_local_names(node))
+        super(LoggingVisitor, self).generic_visit(node)
+        self.current_local_names.pop()
+        self.current_loop_depth = loop_depth
+        self.current_definitions = definitions
+        self.current_function_async = function_async
+
+    visit_Lambda = visit_FunctionDef
+
+    def visit_AsyncFunctionDef(self, node):
+        self.async_module = True
+        self.visit_FunctionDef(node, is_async=True)
+
+    def visit_Import(self, node):
+        if any(alias.name.split(".")[0] == "asyncio" for alias in node.names):
+            self.async_module = True
+        super(LoggingVisitor, self).generic_visit(node)
+
+    def visit_ImportFrom(self, node):
+        if node.module is not None and node.module.split(".")[0] == "asyncio":
+            self.async_module = True
+        super(LoggingVisitor, self).generic_visit(node)
+
+    def visit_Module(self, node):
+        if self.constant_templates:
+            self.module_constants = get_module_constants(node.body)
+        super(LoggingVisitor, self).generic_visit(node)
+        self.finish_module()
+
+    def finish_module(self):
+        """
+        Run the checks that need the whole module, once every statement has been visited.
+
+        """
+        self.check_async_handlers()
+        if self.logging_flags:
+            self.check_logging_flags()
+        self.reset_module_state()
+
+    def visit_ClassDef(self, node):
+        """
+        Process class definitions.
+
+        Names bound in a class body are not locals of the enclosing function.
+
+        """
+        definitions, self.current_definitions = self.current_definitions, None
+        super(LoggingVisitor, self).generic_visit(node)
+        self.current_definitions = definitions
+
+    def visit_If(self, node):
+        """
+        Process if statements, merging the definitions that reach the end of each branch.
+
+        """
+        self.visit(node.test)
+        before = self.copy_definitions()
+        for child in node.body:
+            self.visit(child)
+        after_body, self.current_definitions = self.current_definitions, before
+        for child in node.orelse:
+            self.visit(child)
+        self.merge_definitions(after_body)
+
+    def visit_Try(self, node):
+        """
+        Process try statements.
+
+        Any prefix of the try body may have run before a handler is entered.
+
+        """
+        before = self.copy_definitions()
+        for child in node.body:
+            self.visit(child)
+        self.merge_definitions(before)
+        after_body = self.copy_definitions()
+        branches = []
+        for handler in node.handlers:
+            self.current_definitions = self.copy_definitions(after_body)
+            self.visit(handler)
+            branches.append(self.current_definitions)
+        self.current_definitions = after_body
+        for child in node.orelse:
+            self.visit(child)
+        for branch in branches:
+            self.merge_definitions(branch)
+        for child in node.finalbody:
+            self.visit(child)
+
+    visit_TryStar = visit_Try
+
+    def visit_Assign(self, node):
+        """
+        Process assignments, recording simple local definitions.
+
+        """
+        super(LoggingVisitor, self).generic_visit(node)
+        if len(node.targets) == 1:
+            self.define(node.targets[0], node.value)
+            if isinstance(node.targets[0], Name) and is_blocking_handler(node.value):
+                self.bound_handlers[node.targets[0].id] = (get_position(node.value), get_call_name(node.value))
+        for target in node.targets:
+            if isinstance(target, Attribute) and target.attr in LOGGING_FLAGS and is_falsy_literal(node.value):
+                self.disabled_logging_flags.add(target.attr)
+
+    def visit_AnnAssign(self, node):
+        super(LoggingVisitor, self).generic_visit(node)
+        if node.value is not None:
+            self.define(node.target, node.value)
+
+    def visit_AugAssign(self, node):
+        """
+        Process augmented assignments; `msg += ...` builds a message just like `msg = msg + ...`.
+
+        """
+        super(LoggingVisitor, self).generic_visit(node)
+        self.define(node.target, node)
+
+    def visit_Name(self, node):
+        """
+        Any other binding of a name kills its known definitions.
+
+        """
+        if self.current_definitions is not None and not isinstance(node.ctx, Load):
+            self.current_definitions.pop(node.id, None)
+
+    def define(self, target, value):
+        if self.current_definitions is not None and isinstance(target, Name):
+            self.current_definitions[target.id] = (value,)
+
+    def copy_definitions(self, definitions=None):
+        if definitions is None:
+            definitions = self.current_definitions
+        if definitions is None:
+            return None
+        return dict(definitions)
+
+    def merge_definitions(self, other):
+        """
+        Merge definitions reaching the same point from another control flow path.
+
+        """
+        if self.current_definitions is None or other is None:
+            return
+        for name, values in other.items():
+            current = self.current_definitions.get(name, ())
+            self.current_definitions[name] = current + tuple(value for value in values if value not in current)
 
     def detect_logging_level(self, node):
         """
         Heuristic to decide whether an AST Call is a logging call.
 
+        Receivers known from the logger aliases are classified precisely.
+
         """
+        if isinstance(node.func, Attribute) and node.func.attr in LOGGING_LEVELS:
+            kind = self.get_receiver_kind(node.func.value)
+            if kind is not None:
+                return node.func.attr if kind == "logger" else None
+
         try:
             if self.get_id_attr(node.func.value) in ["parser", "warnings"]:
                 return None
@@ -215,6 +825,29 @@ class LoggingVisitor(NodeVisitor):
             pass
         return None
 
+    def get_receiver_kind(self, node):
+        """
+        Classify the receiver of a call using the project's logger aliases, if known.
+
+        Returns "logger", "other" or None if unknown, e.g. for local names or attributes.
+
+        """
+        if not self.logger_aliases:
+            return None
+        if isinstance(node, Call):
+            return "logger" if self.get_alias(node.func) == "factory" else None
+
+        kind = self.get_alias(node)
+        if kind == "factory":
+            # calling a method on the factory itself
+            return "other"
+        return kind
+
+    def get_alias(self, node):
+        if not isinstance(node, Name) or any(node.id in names for names in self.current_local_names):
+            return None
+        return self.logger_aliases.get(node.id)
+
     def is_format_call(self, node):
         """
         Does a function call use format?
@@ -284,21 +917,132 @@ class LoggingVisitor(NodeVisitor):
 
     def is_str_exception(self, node):
         """
-        Checks if the node is the expression str(e) or unicode(e), where e is an exception name from an except block
+        Checks if the node is the expression str(e), unicode(e) or repr(e), where e is an exception name from an
+        except block
 
         """
         return (
             isinstance(node, Call)
             and isinstance(node.func, Name)
-            and node.func.id in ('str', 'unicode')
+            and node.func.id in ('str', 'unicode', 'repr')
             and node.args
             and self.is_bare_exception(node.args[0])
         )
 
+    def is_traceback_call(self, node):
+        """
+        Checks if the node calls one of the traceback formatting functions, e.g. traceback.format_exc()
+
+        """
+        if not isinstance(node, Call):
+            return False
+        if isinstance(node.func, Attribute):
+            return node.func.attr in TRACEBACK_FUNCTIONS and self.get_id_attr(node.func) == "traceback"
+        return isinstance(node.func, Name) and node.func.id in TRACEBACK_FUNCTIONS
+
+    def check_traceback_call(self, node):
+        """
+        Reports tracebacks formatted anywhere in a logging call's arguments, including extra values.
+
+        The traceback is formatted even if the record is dropped; exc_info defers that to the handler.
+
+        """
+        try:
+            is_traceback_call = self.is_traceback_call(node)
+        except AttributeError:
+            return
+        if is_traceback_call:
+            self.violations.append((node, TRACEBACK_VIOLATION.format(get_call_name(node))))
+
     def check_exception_arg(self, node):
         if self.is_bare_exception(node) or self.is_str_exception(node):
             self.violations.append((self.current_logging_call, EXCEPTION_VIOLATION))
 
+    def check_message_definitions(self, node):
+        """
+        Reports violations on the local definitions of a variable passed as the logging message.
+
+        `msg = f"..."` followed by `logger.info(msg)` costs the same as formatting inline.
+
+        """
+        if self.current_definitions is None or not isinstance(node, Name):
+            return
+
+        for value in self.current_definitions.get(node.id, ()):
+            if value in self.reported_definitions:
+                continue
+            violation = self.get_preformatted_violation(value)
+            if violation is not None:
+                self.reported_definitions.add(value)
+                self.violations.append((value, violation))
+
+    def resolve_template(self, node):
+        """
+        Resolve a message to its constant template: a string literal, or a name only ever bound to the same one.
+
+        Names are resolved through their local definitions, if any, and otherwise the module constants;
+        local names without tracked definitions, such as arguments and loop targets, are not constant.
+        Returns None for messages that are not constant.
+
+        """
+        template = get_template_value(node)
+        if template is not None or not isinstance(node, Name):
+            return template
+        if self.current_definitions is not None and node.id in self.current_definitions:
+            templates = {get_template_value(value) for value in self.current_definitions[node.id]}
+            return templates.pop() if len(templates) == 1 else None
+        if any(node.id in names for names in self.current_local_names):
+            return None
+        return self.module_constants.get(node.id)
+
+    def check_constant_template(self, node):
+        """
+        Reports message templates that cannot be catalogued, unless already reported as formatted or as an exception.
+
+        """
+        if self.resolve_template(node) is not None or self.get_preformatted_violation(node) is not None:
+            return
+        if self.is_bare_exception(node) or self.is_str_exception(node):
+            return
+        if isinstance(node, Name) and self.current_definitions and any(
+            self.get_preformatted_violation(value) is not None
+            for value in self.current_definitions.get(node.id, ())
+        ):
+            return
+        self.violations.append((node, NON_CONSTANT_TEMPLATE_VIOLATION))
+
+    def get_preformatted_violation(self, node):
+        if isinstance(node, (BinOp, AugAssign)):
+            if isinstance(node.op, Mod):
+                return PERCENT_FORMAT_VIOLATION
+            if isinstance(node.op, Add):
+                return STRING_CONCAT_VIOLATION
+        elif isinstance(node, Call):
+            if self.is_format_call(node):
+                return STRING_FORMAT_VIOLATION
+        elif version_info >= (3, 6) and isinstance(node, JoinedStr):
+            if any(isinstance(value, FormattedValue) for value in node.values):
+                return FSTRING_VIOLATION
+        return None
+
+    def check_extra_budget(self, node):
+        """
+        Reports violations if the extra argument has too many fields, deeply nested values or large objects.
+
+        """
+        items = get_extra_items(node)
+        if items is None:
+            return
+
+        if self.max_extra_keys is not None and len(items) > self.max_extra_keys:
+            self.violations.append((self.current_logging_call, EXTRA_KEYS_BUDGET_VIOLATION.format(len(items))))
+
+        for key, value in items:
+            if self.max_extra_depth is not None and get_literal_depth(value) > self.max_extra_depth:
+                self.violations.append((self.current_logging_call, EXTRA_DEPTH_BUDGET_VIOLATION.format(key)))
+            if is_large_object(value):
+                self.violations.append((self.current_logging_call, EXTRA_LARGE_OBJECT_VIOLATION.format(key)))
+
     def check_exc_info(self, node):
         """
         Reports a violation if exc_info keyword is used with logging.error or logging.exception.
@@ -314,3 +1058,161 @@ class LoggingVisitor(NodeVisitor):
                 else:
                     violation = REDUNDANT_EXC_INFO_VIOLATION
                 self.violations.append((node, violation))
+
+    def check_low_level_exc_info(self, node):
+        """
+        Reports a violation if exc_info is used at debug or info level outside of an except block or inside a loop.
+
+        """
+        if self.current_logging_level not in LOW_LEVELS:
+            return
+
+        for kw in node.keywords:
+            if kw.arg == 'exc_info' and not is_falsy_literal(kw.value):
+                if not self.within_except_block():
+                    self.violations.append((node, LOW_LEVEL_EXC_INFO_VIOLATION))
+                if self.within_loop():
+                    self.violations.append((node, LOOP_EXC_INFO_VIOLATION))
+
+    def check_stack_info(self, node):
+        """
+        Reports a violation if stack_info is enabled below the error level.
+
+        The stack is walked and formatted for every record that is emitted, not just for errors.
+
+        """
+        if self.current_logging_level in ERROR_LEVELS:
+            return
+
+        for kw in node.keywords:
+            if kw.arg == 'stack_info' and not is_falsy_literal(kw.value):
+                self.violations.append((node, STACK_INFO_VIOLATION))
+
+    def check_handler_call(self, node):
+        """
+        Record handler setup, to be checked against the module as a whole in `check_async_handlers`.
+
+        """
+        name = get_call_name(node)
+        if name in BLOCKING_HANDLERS:
+            self.handler_setup = True
+            self.blocking_handlers.append((get_position(node), name))
+        elif name in QUEUE_HANDLERS:
+            self.queue_setup = True
+            if name == "QueueListener":
+                # QueueListener(queue, *handlers) runs its handlers on its own thread
+                self.queued_handlers.extend(map(get_handler_reference, node.args[1:]))
+        elif name in HANDLER_SETUP_CALLS:
+            self.handler_setup = True
+            if name == "addHandler" and node.args:
+                self.attached_handlers.append((get_position(node), get_handler_reference(node.args[0])))
+
+    def resolve_handler(self, reference):
+        """
+        Find the blocking handler construction, as its position and name, that a reference refers to, if any.
+
+        """
+        if isinstance(reference, str):
+            return self.bound_handlers.get(reference)
+        return reference
+
+    def check_async_handlers(self):
+        """
+        In modules that run an event loop, blocking handlers should only be used behind a QueueListener.
+
+        Each blocking handler is reported once: where it is attached to a logger, if it is, and
+        otherwise where it is constructed. Logging calls in async functions are reported when the
+        module sets up handlers without any queue.
+
+        """
+        if not self.async_module:
+            return
+
+        queued = {
+            handler[0]
+            for handler in map(self.resolve_handler, self.queued_handlers)
+            if handler is not None
+        }
+        attached = set()
+        for position, reference in self.attached_handlers:
+            handler = self.resolve_handler(reference)
+            if handler is None or handler[0] in queued:
+                continue
+            attached.add(handler[0])
+            self.violations.append((position, ATTACHED_BLOCKING_HANDLER_VIOLATION.format(handler[1])))
+
+        for position, name in self.blocking_handlers:
+            if position not in queued and position not in attached:
+                self.violations.append((position, BLOCKING_HANDLER_VIOLATION.format(name)))
+
+        if self.handler_setup and not self.queue_setup:
+            for position in self.async_logging_calls:
+                self.violations.append((position, ASYNC_UNQUEUED_VIOLATION))
+
+    def check_dict_config_call(self, node):
+        """
+        Check the literal parts of a `dictConfig({...})` call like a configuration file.
+
+        The fields its formatters use are recorded for `check_logging_flags`, as long as the whole
+        configuration is literal; handlers or formatters built from other objects may use any field.
+
+        """
+        if get_call_name(node) != "dictConfig":
+            return
+        if not node.args or not is_literal(node.args[0]):
+            self.formatter_fields_unknown = True
+        if not node.args or not isinstance(node.args[0], Dict):
+            return
+        config = evaluate_literal(node.args[0])
+        for name, reason in check_dict_config(config):
+            self.violations.append((find_entry_node(node.args[0], name), reason))
+        self.formatter_fields.update(get_dict_config_fields(config))
+
+    def check_formatter_call(self, node):
+        """
+        Check the literal template of a `Formatter(...)` or `basicConfig(format=...)` call for costly fields.
+
+        """
+        name = get_call_name(node)
+        if name in LOGGING_CONFIG_CALLS:
+            self.logging_config_calls.append(get_position(node))
+        if name == "fileConfig":
+            # the formatters are in the configuration file
+            self.formatter_fields_unknown = True
+
+        arguments = {keyword.arg: keyword.value for keyword in node.keywords}
+        if name == "Formatter":
+            template = node.args[0] if node.args else arguments.get("fmt")
+            style = node.args[2] if len(node.args) > 2 else arguments.get("style")
+        elif name == "basicConfig":
+            template, style = arguments.get("format"), arguments.get("style")
+        else:
+            return
+
+        value = get_string_value(template) if template is not None else None
+        if value is None:
+            return
+        fields = get_format_fields(value, get_string_value(style) if style is not None else "%")
+        self.formatter_fields.update(fields)
+
+        for severity, violation in (("high", FORMATTER_HIGH_COST_VIOLATION), ("low", FORMATTER_LOW_COST_VIOLATION)):
+            costly = sorted(set(field for field in fields if self.field_severities.get(field) == severity))
+            if costly:
+                self.violations.append((template, violation.format(", ".join(costly))))
+
+    def check_logging_flags(self):
+        """
+        Modules that configure logging should opt out of the per-record lookups their formatters do not use.
+
+        Nothing is reported when the module's formatters cannot all be seen, as with `fileConfig`.
+
+        """
+        if not self.logging_config_calls or self.formatter_fields_unknown:
+            return
+        missing = [
+            flag
+            for flag, fields in sorted(LOGGING_FLAGS.items())
+            if flag not in self.disabled_logging_flags and not self.formatter_fields.intersection(fields)
+        ]
+        if missing:
+            self.violations.append((self.logging_config_calls[0], LOGGING_FLAGS_VIOLATION.format(", ".join(missing))))
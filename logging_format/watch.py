@@ -0,0 +1,278 @@
+"""
+Watch mode: relint only the files that change.
+
+Uses inotify where available and falls back to polling file modification times.
+
+"""
+from ctypes import CDLL, get_errno
+from ctypes.util import find_library
+from os import (
+    close,
+    fsdecode,
+    fsencode,
+    read,
+    stat,
+    strerror,
+    walk,
+)
+from os.path import (
+    abspath,
+    dirname,
+    isdir,
+    join,
+    normpath,
+    sep,
+)
+from select import select
+from struct import calcsize, unpack_from
+from time import sleep, time
+
+from logging_format.runner import (
+    SOURCE_SUFFIX,
+    ResultCache,
+    format_violation,
+    iter_python_files,
+    read_source,
+)
+
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+EVENT_FORMAT = "iIII"
+EVENT_SIZE = calcsize(EVENT_FORMAT)
+
+
+def iter_directories(paths):
+    for path in paths:
+        if not isdir(path):
+            continue
+        for dirpath, dirnames, _ in walk(path):
+            dirnames[:] = sorted(name for name in dirnames if not name.startswith("."))
+            yield dirpath
+
+
+def within_paths(path, paths):
+    """
+    Is the path one of, or contained in one of, the watched paths?
+
+    """
+    path = abspath(path)
+    for root in paths:
+        root = abspath(root)
+        if path == root or path.startswith(root.rstrip(sep) + sep):
+            return True
+    return False
+
+
+class InotifyWatcher(object):
+    """
+    Report changed python files using inotify.
+
+    """
+    def __init__(self, paths):
+        self.libc = CDLL(find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = get_errno()
+            raise OSError(errno, strerror(errno))
+
+        self.paths = paths
+        self.directories = {}
+        for directory in iter_directories(paths):
+            self.add_watch(directory)
+        # files given explicitly are watched through their parent directory
+        for path in paths:
+            if not isdir(path):
+                self.add_watch(dirname(path) or ".")
+
+    def add_watch(self, directory):
+        wd = self.libc.inotify_add_watch(self.fd, fsencode(directory), WATCH_MASK)
+        if wd >= 0:
+            self.directories[wd] = directory
+
+    def remove_watches(self, path):
+        """
+        Stop watching a directory and its subdirectories, e.g. once moved out of the watched paths.
+
+        """
+        for wd, directory in list(self.directories.items()):
+            if within_paths(directory, [path]):
+                self.libc.inotify_rm_watch(self.fd, wd)
+                del self.directories[wd]
+
+    def read(self, timeout):
+        ready, _, _ = select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        try:
+            data = read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset + EVENT_SIZE <= len(data):
+            wd, mask, _, length = unpack_from(EVENT_FORMAT, data, offset)
+            # names need not be valid in any encoding; keep their bytes as surrogates, as os.listdir does
+            name = fsdecode(data[offset + EVENT_SIZE:offset + EVENT_SIZE + length].rstrip(b"\0"))
+            offset += EVENT_SIZE + length
+
+            if mask & IN_IGNORED:
+                self.directories.pop(wd, None)
+                continue
+
+            directory = self.directories.get(wd)
+            if directory is None or not name:
+                continue
+
+            path = join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # watch new packages and pick up any files created before the watch was added
+                    for subdirectory in iter_directories([path]):
+                        self.add_watch(subdirectory)
+                    changed.update(iter_python_files([path]))
+                elif mask & (IN_MOVED_FROM | IN_DELETE):
+                    # report the directory itself, so that results for every file under it are dropped
+                    self.remove_watches(path)
+                    changed.add(path)
+            elif name.endswith(SOURCE_SUFFIX) and within_paths(path, self.paths):
+                changed.add(path)
+
+        return changed
+
+    def close(self):
+        close(self.fd)
+
+
+class PollingWatcher(object):
+    """
+    Report changed python files by comparing modification times and sizes.
+
+    """
+    def __init__(self, paths, interval=1.0):
+        self.paths = paths
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self):
+        snapshot = {}
+        for path in iter_python_files(self.paths):
+            try:
+                stat_result = stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (stat_result.st_mtime_ns, stat_result.st_size)
+        return snapshot
+
+    def read(self, timeout):
+        sleep(min(timeout, self.interval) if timeout is not None else self.interval)
+
+        snapshot = self.scan()
+        changed = {
+            path
+            for path in set(snapshot) | set(self.snapshot)
+            if snapshot.get(path) != self.snapshot.get(path)
+        }
+        self.snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+
+def make_watcher(paths, polling=False):
+    if not polling:
+        try:
+            return InotifyWatcher(paths)
+        except (AttributeError, OSError, TypeError):
+            # no inotify on this platform
+            pass
+    return PollingWatcher(paths)
+
+
+def wait_for_changes(watcher, debounce):
+    """
+    Block until files change, then keep collecting until saves have been quiet for `debounce` seconds.
+
+    """
+    changed = set()
+    while not changed:
+        changed = watcher.read(1.0)
+
+    while True:
+        more = watcher.read(debounce)
+        if not more:
+            return changed
+        changed |= more
+
+
+def relint(cache, paths):
+    """
+    Relint changed paths, dropping results for files (or directories of files) that no longer exist.
+
+    """
+    violations = []
+    for path in sorted({normpath(path) for path in paths}):
+        try:
+            source = read_source(path)
+        except (IOError, OSError):
+            for cached_path in [cached_path for cached_path in cache.results if within_paths(cached_path, [path])]:
+                cache.discard(cached_path)
+            continue
+        violations.extend(cache.lint(path, source))
+    return violations
+
+
+def report(outfile, cache, violations, count, started):
+    for violation in violations:
+        outfile.write(format_violation(violation))
+        outfile.write("\n")
+    outfile.write("{} violations in {} files (checked {} files in {:.1f} ms)\n".format(
+        cache.count,
+        len(cache),
+        count,
+        (time() - started) * 1000,
+    ))
+    outfile.flush()
+
+
+def watch(paths, outfile, debounce=0.2, polling=False, iterations=None, **options):
+    """
+    Lint all paths, then relint changed files until interrupted.
+
+    Options are passed to the visitor.
+
+    """
+    cache = ResultCache(**options)
+    watcher = make_watcher(paths, polling=polling)
+
+    try:
+        started = time()
+        initial = list(iter_python_files(paths))
+        report(outfile, cache, relint(cache, initial), len(initial), started)
+
+        while iterations is None or iterations > 0:
+            changed = wait_for_changes(watcher, debounce)
+            started = time()
+            report(outfile, cache, relint(cache, changed), len(changed), started)
+            if iterations is not None:
+                iterations -= 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+    return cache
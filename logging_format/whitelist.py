@@ -2,22 +2,32 @@
 A logging extra keyword argument whitelist.
 
 """
-from pkg_resources import iter_entry_points
+from hashlib import sha1
+from json import dump, load
+
+from pkg_resources import iter_entry_points, working_set
+
+
+DEFAULT_GROUP = "logging.extra.whitelist"
+
+SNAPSHOT_VERSION = 1
 
 
 class Whitelist(object):
     """
     A pluggable whitelist.
 
-    Uses entry points.
+    Uses entry points. Loading a provider imports its module, so the resolved keys may instead be
+    read from a snapshot file, which is used for as long as the installed distributions and the
+    group's entry points are unchanged.
 
     """
-    def __init__(self, group="logging.extra.whitelist"):
-        self.legal_keys = {
-            legal_key
-            for entry_point in iter_entry_points(group)
-            for legal_key in entry_point.load()()
-        }
+    def __init__(self, group=DEFAULT_GROUP, snapshot=None):
+        self.legal_keys = None
+        if snapshot is not None:
+            self.legal_keys = load_snapshot(snapshot, group)
+        if self.legal_keys is None:
+            self.legal_keys = load_legal_keys(group)
 
     def __iter__(self):
         return iter(self.legal_keys)
@@ -26,6 +36,66 @@ class Whitelist(object):
         return key in self.legal_keys
 
 
+def load_legal_keys(group):
+    return {
+        legal_key
+        for entry_point in iter_entry_points(group)
+        for legal_key in entry_point.load()()
+    }
+
+
+def fingerprint(group):
+    """
+    Fingerprint the installed distributions and the group's entry points, without importing them.
+
+    """
+    digest = sha1()
+    for distribution in sorted(working_set, key=lambda distribution: distribution.key):
+        digest.update("{} {} {}\n".format(distribution.key, distribution.version, distribution.location).encode())
+    for entry_point in sorted(iter_entry_points(group), key=str):
+        digest.update("{} {}\n".format(entry_point, entry_point.dist).encode())
+    return digest.hexdigest()
+
+
+def write_snapshot(path, group=DEFAULT_GROUP):
+    """
+    Resolve all whitelist providers once and write their keys to a snapshot file.
+
+    """
+    legal_keys = load_legal_keys(group)
+    with open(path, "w") as outfile:
+        dump(
+            dict(
+                version=SNAPSHOT_VERSION,
+                group=group,
+                fingerprint=fingerprint(group),
+                legal_keys=sorted(legal_keys),
+            ),
+            outfile,
+        )
+    return legal_keys
+
+
+def load_snapshot(path, group=DEFAULT_GROUP):
+    """
+    Read the legal keys from a snapshot file.
+
+    Returns None if the snapshot is missing, unreadable or out of date.
+
+    """
+    try:
+        with open(path) as infile:
+            snapshot = load(infile)
+    except (IOError, OSError, ValueError):
+        return None
+
+    if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+        return None
+    if snapshot.get("group") != group or snapshot.get("fingerprint") != fingerprint(group):
+        return None
+    return set(snapshot["legal_keys"])
+
+
 def example_whitelist():
     """
     Example whitelist entry point used for testing.
@@ -28,7 +28,10 @@ setup(
         ],
         "lint": [
             "flake8",
-        ]
+        ],
+        "yaml": [
+            "PyYAML",
+        ],
     },
     dependency_links=[
     ],